@@ -26,6 +26,7 @@ else:
 
 # Import the code with the actual implementation
 from convex_hull import *
+from convex_hull_3d import *
 
 
 # This class controls the visual stuff in the GUI.  An instance of it is passed to the solver
@@ -40,6 +41,11 @@ class PointLineView( QWidget ):
 		self.lineList   = {}
 		self.status_bar = status_bar
 
+		# frames of a HullEventLog that are still waiting to be drawn
+		self.frames      = None
+		self.replayTimer = QTimer(self)
+		self.replayTimer.timeout.connect(self.nextFrame)
+
 	def displayStatusText(self, text):
 		self.status_bar.showMessage(text)
 		self.update()
@@ -75,6 +81,33 @@ class PointLineView( QWidget ):
 		self.update()
 		app.processEvents()
 
+	# Plays back the steps recorded by the solver, one coalesced frame per timer tick
+	def replay( self, events ):
+		interval, stepsPerFrame = events.schedule()
+		self.frames = events.frames(stepsPerFrame)
+		self.replayTimer.start(interval)
+
+	def stopReplay( self ):
+		self.replayTimer.stop()
+		self.frames = None
+
+	def nextFrame( self ):
+		frame = next(self.frames, None) if self.frames else None
+		if frame is None:
+			self.stopReplay()
+			return
+		erased, added = frame
+		for color in self.lineList:
+			for line in erased:
+				if line in self.lineList[color]:
+					self.lineList[color].remove(line)
+		for color in added:
+			if color in self.lineList:
+				self.lineList[color].extend( added[color] )
+			else:
+				self.lineList[color] = added[color]
+		self.update()
+
 	def paintEvent(self, event):
 		painter = QPainter(self)
 
@@ -114,9 +147,12 @@ class Proj2GUI( QMainWindow ):
 
 		# This is where the points for a problem instance are kept
 		self.points = None
+		# The same points with their z coordinate, only kept for the spherical distribution
+		self.points3d = None
 
 		# Getting an instance of your solver
 		self.solver = ConvexHullSolver()
+		self.solver3d = ConvexHull3DSolver()
 
 		# start the GUI
 		self.initUI()
@@ -131,6 +167,7 @@ class Proj2GUI( QMainWindow ):
 			random.seed( time.time() )
 
 		ptlist = []
+		self.points3d = None
 		unique_xvals = {}
 		max_r  = 0.98
 		WIDTH  = 1.0
@@ -147,6 +184,7 @@ class Proj2GUI( QMainWindow ):
 						ptlist.append( QPointF(xval,yval) )
 						unique_xvals[xval] = 1
 		elif self.distribSphere.isChecked():
+			self.points3d = []
 			while len(ptlist) < npoints:
 				x = random.uniform(-1.0,1.0)
 				y = random.uniform(-1.0,1.0)
@@ -156,6 +194,7 @@ class Proj2GUI( QMainWindow ):
 					yval = HEIGHT*y
 					if not xval in unique_xvals:
 						ptlist.append( QPointF(xval,yval) )
+						self.points3d.append( (xval,yval,z) )
 						unique_xvals[xval] = 1
 		elif self.distribGaussian.isChecked():
 			while len(ptlist) < npoints:
@@ -171,6 +210,7 @@ class Proj2GUI( QMainWindow ):
 
 # Methods that handle GUI events
 	def clearClicked(self):
+		self.view.stopReplay()
 		self.view.clearLines()
 		self.view.displayStatusText('')
 		self.solveButton.setEnabled(True)
@@ -178,6 +218,7 @@ class Proj2GUI( QMainWindow ):
 		app.processEvents()
 
 	def generateClicked(self):
+		self.view.stopReplay()
 		if self.points:
 			self.view.clearPoints()
 			self.view.clearLines()
@@ -197,7 +238,10 @@ class Proj2GUI( QMainWindow ):
 		self.solveButton.setEnabled(False)
 		self.view.update()
 		app.processEvents()
-		self.solver.compute_hull(self.points,self.showRecursion.isChecked(),self.view)
+		if self.hull3d.isChecked() and self.points3d:
+			self.solver3d.compute_hull(self.points3d,self.view)
+		else:
+			self.solver.compute_hull(self.points,self.showRecursion.isChecked(),self.view)
 		self.generateButton.setEnabled(True)
 		self.clearButton.setEnabled(True)
 		self.view.update()
@@ -236,6 +280,7 @@ class Proj2GUI( QMainWindow ):
 		self.randSeed       = QLineEdit('0')
 
 		self.showRecursion	= QCheckBox('Show Recursion')
+		self.hull3d			= QCheckBox('3D Hull (Spherical)')
 
 		h = QHBoxLayout()
 		h.addWidget( self.view )
@@ -272,6 +317,7 @@ class Proj2GUI( QMainWindow ):
 		h.addWidget( self.randSeed )
 		h.addStretch(1)
 		h.addWidget(self.showRecursion)
+		h.addWidget(self.hull3d)
 		vbox.addLayout(h)
 
 		self.generateButton.clicked.connect(self.generateClicked)
@@ -287,6 +333,7 @@ class Proj2GUI( QMainWindow ):
 		self.generateClicked()
 
 		self.showRecursion.setChecked(False)
+		self.hull3d.setChecked(False)
 
 		self.show()
 
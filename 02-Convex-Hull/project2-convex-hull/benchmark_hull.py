@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+# Headless timing of the 2D divide-and-conquer hull against the 3D incremental hull
+# on the same spherical point clouds that Proj2GUI.newPoints generates.
+#
+# usage: python3 benchmark_hull.py [npoints ...]
+
+import random
+import sys
+import time
+
+from which_pyqt import PYQT_VER
+if PYQT_VER == 'PYQT5':
+	from PyQt5.QtCore import QPointF
+elif PYQT_VER == 'PYQT4':
+	from PyQt4.QtCore import QPointF
+elif PYQT_VER == 'PYQT6':
+	from PyQt6.QtCore import QPointF
+else:
+	raise Exception('Unsupported Version of PyQt: {}'.format(PYQT_VER))
+
+from convex_hull import ConvexHullSolver
+from convex_hull_3d import ConvexHull3DSolver
+
+SIZES = [1000, 10000, 100000, 1000000]
+
+# same rejection sampling as the 'Spherical' option of Proj2GUI.newPoints, but the z
+# coordinate is kept
+def spherePoints(npoints, seed=0):
+	random.seed(seed)
+	max_r = 0.98
+	ptlist = []
+	unique_xvals = {}
+	while len(ptlist) < npoints:
+		x = random.uniform(-1.0,1.0)
+		y = random.uniform(-1.0,1.0)
+		z = random.uniform(-1.0,1.0)
+		if x**2 + y**2 + z**2 <= max_r**2:
+			if not x in unique_xvals:
+				ptlist.append( (x,y,z) )
+				unique_xvals[x] = 1
+	return ptlist
+
+def time2D(points3d):
+	points = [QPointF(x,y) for x, y, z in points3d]
+	solver = ConvexHullSolver()
+	t1 = time.time()
+	points.sort(key=lambda point: point.x())
+	hull = solver.findHull(points)[0]
+	t2 = time.time()
+	return t2-t1, len(hull)
+
+def time3D(points3d):
+	solver = ConvexHull3DSolver()
+	t1 = time.time()
+	faces = solver.findHull(points3d, seed=0)
+	t2 = time.time()
+	return t2-t1, len(faces)
+
+if __name__ == '__main__':
+	sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+	print('{:>10} {:>12} {:>12} {:>12} {:>12}'.format('points', '2D sec', '2D vertices', '3D sec', '3D faces'))
+	for npoints in sizes:
+		points3d = spherePoints(npoints)
+		t2d, nvertices = time2D(points3d)
+		t3d, nfaces = time3D(points3d)
+		print('{:>10} {:>12.3f} {:>12} {:>12.3f} {:>12}'.format(npoints, t2d, nvertices, t3d, nfaces))
@@ -12,6 +12,8 @@ else:
 
 import time
 import copy
+import math
+from array import array
 
 # Some global color constants that might be useful
 RED = (255,0,0)
@@ -21,9 +23,70 @@ GREEN = (0,255,0)
 BLUE = (0,0,255)
 PURPLE = (128,0,128)
 
-# Global variable that controls the speed of the recursion automation, in seconds
+# Global variable that controls the speed of the recursion automation, in seconds per recorded step
 PAUSE = 0.25
 
+# The recursion is replayed at this many frames per second, and never takes longer than
+# MAX_REPLAY seconds; steps that fall into the same frame are drawn together
+REPLAY_FPS = 30
+MAX_REPLAY = 10.0
+
+# Kinds of steps kept in a HullEventLog
+SHOW = 0
+ERASE = 1
+
+# A compact record of the lines drawn and erased while the hull is computed. The solver
+# appends to it at full speed and the view replays it afterwards, so drawing the
+# recursion no longer slows the recursion down.
+# O(1) amortized time per line recorded, O(n) space for n lines
+class HullEventLog:
+	def __init__( self ):
+		self.ops = array('b')		# SHOW or ERASE, one per step
+		self.colors = array('b')	# index into self.palette, one per step
+		self.ends = array('l')		# end of each step's lines in self.coords, in lines
+		self.coords = array('d')	# x1, y1, x2, y2 of every recorded line
+		self.palette = []
+
+	def __len__( self ):
+		return len(self.ops)
+
+	def record( self, op, lines, color=None ):
+		if not color in self.palette: self.palette.append(color)
+		self.ops.append(op)
+		self.colors.append(self.palette.index(color))
+		for line in lines:
+			self.coords.extend((line.x1(), line.y1(), line.x2(), line.y2()))
+		self.ends.append(len(self.coords) // 4)
+
+	# Returns (interval in ms, steps per frame). Short logs are played back at one step
+	# every PAUSE seconds; long ones are squeezed into MAX_REPLAY seconds at fps frames
+	# per second by putting several steps into each frame.
+	def schedule( self, fps=REPLAY_FPS, pause=PAUSE, maxSeconds=MAX_REPLAY ):
+		duration = min(len(self) * pause, maxSeconds)
+		numFrames = max(1, min(len(self), int(duration * fps)))
+		return int(1000 * duration / numFrames), math.ceil(len(self) / numFrames)
+
+	# Yields one (erased lines, {color: shown lines}) pair per frame. A line that is shown
+	# and erased again within the same frame (a blinking tangent) is never drawn at all.
+	def frames( self, stepsPerFrame ):
+		for first in range(0, len(self), stepsPerFrame):
+			erased = []
+			shown = {} # (x1, y1, x2, y2) -> color, in the order the lines were shown
+			for step in range(first, min(first + stepsPerFrame, len(self))):
+				start = self.ends[step - 1] if step > 0 else 0
+				for i in range(start, self.ends[step]):
+					key = tuple(self.coords[4 * i: 4 * i + 4])
+					if self.ops[step] == SHOW:
+						shown[key] = self.palette[self.colors[step]]
+					elif key in shown:
+						del shown[key]
+					else:
+						erased.append(QLineF(*key))
+			added = {}
+			for key, color in shown.items():
+				added.setdefault(color, []).append(QLineF(*key))
+			yield erased, added
+
 class ConvexHullSolver(QObject):
 
 	count = 0
@@ -32,29 +95,31 @@ class ConvexHullSolver(QObject):
 	def __init__( self):
 		super().__init__()
 		self.pause = False
+		self.events = None
 
 # Some helper methods that make calls to the GUI, allowing us to send updates
-# to be displayed.
+# to be displayed. While the recursion is being shown they only record the step
+# in self.events, which the view replays once the hull is done.
 
 	def showTangent(self, line, color):
-		self.view.addLines(line,color)
-		if self.pause:
-			time.sleep(PAUSE)
+		if self.pause: self.events.record(SHOW, line, color)
+		else: self.view.addLines(line,color)
 
 	def eraseTangent(self, line):
-		self.view.clearLines(line)
+		if self.pause: self.events.record(ERASE, line)
+		else: self.view.clearLines(line)
 
 	def blinkTangent(self,line,color):
 		self.showTangent(line,color)
 		self.eraseTangent(line)
 
 	def showHull(self, polygon, color):
-		self.view.addLines(polygon,color)
-		if self.pause:
-			time.sleep(PAUSE)
+		if self.pause: self.events.record(SHOW, polygon, color)
+		else: self.view.addLines(polygon,color)
 
 	def eraseHull(self,polygon):
-		self.view.clearLines(polygon)
+		if self.pause: self.events.record(ERASE, polygon)
+		else: self.view.clearLines(polygon)
 
 	def showText(self,text):
 		self.view.displayStatusText(text)
@@ -64,6 +129,7 @@ class ConvexHullSolver(QObject):
 	def compute_hull( self, points, pause, view):
 		self.pause = pause
 		self.view = view
+		self.events = HullEventLog() if pause else None
 		assert( type(points) == list and type(points[0]) == QPointF )
 
 		t1 = time.time()
@@ -83,6 +149,7 @@ class ConvexHullSolver(QObject):
 		# object can be created with two QPointF objects corresponding to the endpoints
 		self.showHull(polygon,RED)
 		self.showText('Time Elapsed (Convex Hull): {:3.3f} sec'.format(t4-t3))
+		if self.pause: self.view.replay(self.events)
 
 	# input a list of QPointF objects describing all points in the region
 	# output a list of QLineF objects describing only the convex hull, as well as the rightmost point
@@ -106,6 +173,8 @@ class ConvexHullSolver(QObject):
 		UL, UR = self.upperTangent(lPoints, rPoints, rightmostLPointIndex)
 		LL, LR = self.lowerTangent(lPoints, rPoints, rightmostLPointIndex)
 
+		if self.pause: self.showMerge(lPoints, rPoints, (UL, UR), (LL, LR))
+
 		rightmostRPointIndex = (UL - UR + rightmostRPointIndex + 1)
 
 		# this accounts for the case that either of the bottom two connection points are the
@@ -256,6 +325,18 @@ class ConvexHullSolver(QObject):
 	def findSlope(self, p1, p2):
 		return (p2.y() - p1.y()) / (p2.x() - p1.x())
 	
+	# records one merge step: both subhulls, then their tangents, then everything is erased again
+	def showMerge(self, lPoints, rPoints, upper, lower):
+		lHull = self.pointsToLines(lPoints)
+		rHull = self.pointsToLines(rPoints)
+		tangents = [QLineF(lPoints[upper[0]], rPoints[upper[1]]),
+					QLineF(lPoints[lower[0]], rPoints[lower[1]])]
+		self.showHull(lHull, PURPLE)
+		self.showHull(rHull, PURPLE)
+		self.blinkTangent(tangents, GREEN)
+		self.eraseHull(lHull)
+		self.eraseHull(rHull)
+
 	# sends the set of points and the message to the GUI
 	def showPoints(self, points, color, message):
 		self.showText(message)
@@ -265,7 +346,7 @@ class ConvexHullSolver(QObject):
 
 	# converts a set of QPointF points to a set of QLineF lines
 	def pointsToLines(self, points):
-		hull = [QLineF(points[i], points[i + 1]) for i in range(len(points) - 2)]
+		hull = [QLineF(points[i], points[i + 1]) for i in range(len(points) - 1)]
 		pointFinal = points[-1]
 		pointInitial = points[0]
 		lineFinal = QLineF(pointFinal, pointInitial)
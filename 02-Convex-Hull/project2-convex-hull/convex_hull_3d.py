@@ -0,0 +1,200 @@
+from which_pyqt import PYQT_VER
+if PYQT_VER == 'PYQT5':
+	from PyQt5.QtCore import QLineF, QPointF, QObject
+elif PYQT_VER == 'PYQT4':
+	from PyQt4.QtCore import QLineF, QPointF, QObject
+elif PYQT_VER == 'PYQT6':
+	from PyQt6.QtCore import QLineF, QPointF, QObject
+else:
+	raise Exception('Unsupported Version of PyQt: {}'.format(PYQT_VER))
+
+
+
+import random
+import time
+
+BLUE = (0,0,255)
+
+# Relative tolerance used to decide whether a point is strictly in front of a face.
+# It gets scaled by the size of the point cloud so that coplanar points are not
+# treated as visible because of rounding.
+EPSILON = 1e-12
+
+# A triangular face of the hull. The vertices a, b, c are indices into the point list
+# and are ordered counter-clockwise when looking at the face from outside the hull.
+class Face3D:
+	__slots__ = ('a', 'b', 'c', 'nx', 'ny', 'nz', 'offset', 'conflicts', 'alive')
+
+	def __init__( self, a, b, c, points ):
+		self.a = a
+		self.b = b
+		self.c = c
+		ax, ay, az = points[a]
+		bx, by, bz = points[b]
+		cx, cy, cz = points[c]
+		ux, uy, uz = bx - ax, by - ay, bz - az
+		vx, vy, vz = cx - ax, cy - ay, cz - az
+		# outward normal is (b - a) x (c - a)
+		self.nx = uy * vz - uz * vy
+		self.ny = uz * vx - ux * vz
+		self.nz = ux * vy - uy * vx
+		self.offset = self.nx * ax + self.ny * ay + self.nz * az
+		# indices of the points attached to this face in the conflict graph
+		self.conflicts = []
+		self.alive = True
+
+	# O(1) time
+	def distance( self, p ):
+		return self.nx * p[0] + self.ny * p[1] + self.nz * p[2] - self.offset
+
+	def edges( self ):
+		return ((self.a, self.b), (self.b, self.c), (self.c, self.a))
+
+
+# Randomized incremental 3D convex hull with a conflict graph. Every point that is
+# not yet inserted remembers one face it can see and every face remembers the points
+# attached to it, so inserting a point starts right at its visible region and only
+# the points of the faces it destroys need to be looked at again.
+# Expected O(nlogn) time, O(n) space.
+class ConvexHull3DSolver(QObject):
+
+	def __init__( self ):
+		super().__init__()
+
+	def showHull(self, lines, color):
+		self.view.addLines(lines,color)
+
+	def showText(self,text):
+		self.view.displayStatusText(text)
+
+	# This is the method that gets called by the GUI. points is a list of (x, y, z)
+	# tuples. The hull is drawn as a wireframe projected onto the xy plane.
+	def compute_hull( self, points, view ):
+		self.view = view
+		assert( type(points) == list and type(points[0]) == tuple )
+
+		t1 = time.time()
+		faces = self.findHull(points)
+		t2 = time.time()
+
+		self.showHull(self.facesToLines(points, faces),BLUE)
+		self.showText('Time Elapsed (3D Convex Hull): {:3.3f} sec, {} faces'.format(t2-t1, len(faces)))
+
+	# input a list of (x, y, z) tuples
+	# output a list of (a, b, c) index triples, one per triangular face of the hull,
+	# each ordered counter-clockwise when seen from outside
+	def findHull( self, points, seed=None ):
+		if len(points) < 4: raise ValueError("At least 4 points are needed for a 3D hull.")
+
+		scale = max(max(abs(x), abs(y), abs(z)) for x, y, z in points) or 1.0
+		eps = EPSILON * scale ** 3
+
+		tetra = self._initialTetrahedron(points, eps)
+		inside = self._interiorPoint(points, tetra)
+
+		# edgeMap maps a directed edge (u, v) to the live face that owns it; the face
+		# across that edge owns (v, u)
+		edgeMap = {}
+		faces = []
+		for a, b, c in ((tetra[0], tetra[1], tetra[2]), (tetra[0], tetra[3], tetra[1]),
+						(tetra[1], tetra[3], tetra[2]), (tetra[0], tetra[2], tetra[3])):
+			face = Face3D(a, b, c, points)
+			if face.distance(inside) > 0: face = Face3D(a, c, b, points)
+			faces.append(face)
+			for edge in face.edges(): edgeMap[edge] = face
+
+		# O(n) time: every point that sees no face of the tetrahedron is inside it and
+		# is thrown away immediately, the rest are attached to one face they can see
+		order = [i for i in range(len(points)) if i not in tetra]
+		random.Random(seed).shuffle(order)
+		conflict = [None] * len(points)
+		for p in order:
+			self._assignConflict(p, points, faces, conflict, eps)
+
+		for p in order:
+			face = conflict[p]
+			if face is None: continue # p ended up inside the hull
+
+			# the faces p can see form a connected region around its conflict face, and
+			# the horizon is every edge of that region whose twin face stays alive
+			face.alive = False
+			visible = [face]
+			horizon = []
+			for face in visible:
+				for u, v in face.edges():
+					twin = edgeMap[(v, u)]
+					if not twin.alive: continue
+					if twin.distance(points[p]) > eps:
+						twin.alive = False
+						visible.append(twin)
+					else: horizon.append((u, v))
+
+			for face in visible:
+				for edge in face.edges(): del edgeMap[edge]
+
+			newFaces = []
+			for u, v in horizon:
+				newFace = Face3D(u, v, p, points)
+				newFaces.append(newFace)
+				for edge in newFace.edges(): edgeMap[edge] = newFace
+			faces.extend(newFaces)
+
+			# a point that saw a face which is now gone either sees one of the new faces
+			# or is inside the new hull
+			for face in visible:
+				for q in face.conflicts:
+					if q != p: self._assignConflict(q, points, newFaces, conflict, eps)
+				face.conflicts = None
+
+		return [(face.a, face.b, face.c) for face in faces if face.alive]
+
+	# attaches point p to the first of the given faces that it can see
+	def _assignConflict( self, p, points, faces, conflict, eps ):
+		pt = points[p]
+		for face in faces:
+			if face.distance(pt) > eps:
+				conflict[p] = face
+				face.conflicts.append(p)
+				return
+		conflict[p] = None
+
+	# picks four extreme points that span a non-degenerate tetrahedron
+	def _initialTetrahedron( self, points, eps ):
+		n = len(points)
+		i0 = min(range(n), key=lambda i: points[i][0])
+		i1 = max(range(n), key=lambda i: self._squaredDistance(points[i], points[i0]))
+		p0, p1 = points[i0], points[i1]
+		if self._squaredDistance(p0, p1) == 0: raise ValueError("All points are identical.")
+
+		d = (p1[0] - p0[0], p1[1] - p0[1], p1[2] - p0[2])
+		def lineDistance(i):
+			q = points[i]
+			w = (q[0] - p0[0], q[1] - p0[1], q[2] - p0[2])
+			cx = d[1] * w[2] - d[2] * w[1]
+			cy = d[2] * w[0] - d[0] * w[2]
+			cz = d[0] * w[1] - d[1] * w[0]
+			return cx * cx + cy * cy + cz * cz
+		i2 = max(range(n), key=lineDistance)
+		if lineDistance(i2) <= eps: raise ValueError("All points are collinear.")
+
+		base = Face3D(i0, i1, i2, points)
+		i3 = max(range(n), key=lambda i: abs(base.distance(points[i])))
+		if abs(base.distance(points[i3])) <= eps: raise ValueError("All points are coplanar.")
+
+		return (i0, i1, i2, i3)
+
+	def _interiorPoint( self, points, tetra ):
+		return tuple(sum(points[i][k] for i in tetra) / 4.0 for k in range(3))
+
+	def _squaredDistance( self, p, q ):
+		return (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 + (p[2] - q[2]) ** 2
+
+	# converts a set of faces to QLineF lines projected onto the xy plane, one line per hull edge
+	def facesToLines( self, points, faces ):
+		lines = []
+		for a, b, c in faces:
+			for u, v in ((a, b), (b, c), (c, a)):
+				if u < v: # every edge is shared by two faces, only draw it once
+					lines.append(QLineF(QPointF(points[u][0], points[u][1]),
+										QPointF(points[v][0], points[v][1])))
+		return lines
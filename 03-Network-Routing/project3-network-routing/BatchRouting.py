@@ -0,0 +1,81 @@
+from heapq import heappush, heappop
+from multiprocessing import Pool
+import os
+import tempfile
+
+import numpy as np
+
+from SharedArrays import *
+
+
+# Distances from many sources at once, one Dijkstra per source spread over a pool of
+# worker processes. The graph's CSR arrays are copied once into shared memory that every
+# worker maps, rather than pickled to each of them, and each worker writes its rows
+# straight into a memory-mapped distance matrix on disk, so nothing but row numbers
+# travels back to the parent and the matrix never has to fit in memory.
+
+
+def _initWorker( specs, matrixPath, numRows ):
+    offsets, targets, weights = attachArrays(specs)
+    # memoryviews are faster than NumPy arrays to index one element at a time
+    worker['offsets'] = memoryview(offsets)
+    worker['targets'] = memoryview(targets)
+    worker['weights'] = memoryview(weights)
+    worker['matrix'] = np.memmap(matrixPath, dtype=np.float64, mode='r+', shape=(numRows, len(offsets) - 1))
+
+# Runs Dijkstra from srcIndex and writes the distances into row of the matrix.
+# Returns (row, number of settled nodes).
+def _sourceRow( task ):
+    row, srcIndex = task
+    offsets, targets, weights = worker['offsets'], worker['targets'], worker['weights']
+    distances = [float('inf')] * (len(offsets) - 1)
+    distances[srcIndex] = 0
+    pQueue = [(0, srcIndex)]
+    numSettled = 0
+
+    while pQueue:
+        currDist, currSrc = heappop(pQueue)
+        if currDist > distances[currSrc]: continue # stale entry
+        numSettled += 1
+        for edgeIndex in range(offsets[currSrc], offsets[currSrc + 1]):
+            currDest = targets[edgeIndex]
+            newDist = currDist + weights[edgeIndex]
+            if newDist < distances[currDest]:
+                distances[currDest] = newDist
+                heappush(pQueue, (newDist, currDest))
+
+    worker['matrix'][row] = distances
+    return row, numSettled
+
+# Returns a len(sources) x |V| float64 np.memmap whose row i holds the distances from
+# sources[i] (inf where a node can't be reached). path is the file backing the matrix,
+# a new temporary file when left out, and numWorkers defaults to os.cpu_count().
+# onRow(row, numSettled) is called in the parent as each row is finished, in no
+# particular order.
+def computeManySources( network, sources, path=None, numWorkers=None, onRow=None ):
+    offsets, targets, weights = network.getCSR()
+    numNodes = len(offsets) - 1
+    if len(sources) == 0 or numNodes == 0: return np.zeros((len(sources), numNodes))
+
+    if path == None:
+        fd, path = tempfile.mkstemp(suffix='.dist')
+        os.close(fd)
+    matrix = np.memmap(path, dtype=np.float64, mode='w+', shape=(len(sources), numNodes))
+
+    shared = [shareArray(offsets, np.int64), shareArray(targets, np.int64), shareArray(weights, np.float64)]
+    blocks = [block for block, _, _ in shared]
+    try:
+        initArgs = ([spec for _, _, spec in shared], path, len(sources))
+        numWorkers = numWorkers or os.cpu_count() or 1
+        # a few tasks per worker at a time keeps the pool busy without piling up rows
+        chunkSize = max(1, len(sources) // (4 * numWorkers))
+        with Pool(numWorkers, initializer=_initWorker, initargs=initArgs) as pool:
+            for row, numSettled in pool.imap_unordered(_sourceRow, enumerate(sources), chunkSize):
+                if onRow != None: onRow(row, numSettled)
+    finally:
+        shared = None # the arrays over the blocks have to go before the blocks can be closed
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return matrix
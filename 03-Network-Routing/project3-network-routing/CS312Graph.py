@@ -1,7 +1,57 @@
 #!/usr/bin/python3
 
+from array import array
+import mmap
+import struct
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# O(|V| + |E|) time and space
+# Given the CSR arrays of a graph, returns the CSR arrays of the graph with every edge
+# reversed, i.e. the in-edges of each node. Edges into a node keep their source order.
+def reverseCSR( offsets, targets, weights ):
+    numNodes = len(offsets) - 1
+    inOffsets = array('q', [0]) * (numNodes + 1)
+    for v in targets: inOffsets[v + 1] += 1
+    for u in range(numNodes): inOffsets[u + 1] += inOffsets[u]
+
+    sources = array('q', [0]) * len(targets)
+    inWeights = array('d', [0.0]) * len(targets)
+    nextSlot = inOffsets[:-1]
+    for u in range(numNodes):
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            sources[nextSlot[v]] = u
+            inWeights[nextSlot[v]] = weights[e]
+            nextSlot[v] += 1
+    return (inOffsets, sources, inWeights)
+
+# O(total of counts) time, needs NumPy
+# The indices starts[i], ..., starts[i] + counts[i] - 1 of every range, one range after
+# the other, e.g. the edges out of a list of nodes given their CSR offsets
+def expandRanges( starts, counts ):
+    return np.arange(counts.sum()) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+
+# O(out-degree of u) time
+# Sets the weight of every edge from u to v in a set of CSR arrays, returns how many there were
+def setCSRWeight( offsets, targets, weights, u, v, weight ):
+    numChanged = 0
+    for e in range(offsets[u], offsets[u + 1]):
+        if targets[e] == v:
+            weights[e] = weight
+            numChanged += 1
+    return numChanged
+
 
 class CS312GraphEdge:
+    # no per-instance __dict__, which matters with one of these per edge
+    __slots__ = ('src', 'dest', 'length')
+
     def __init__( self, src_node, dest_node, edge_length ):
         self.src   = src_node
         self.dest  = dest_node
@@ -14,6 +64,8 @@ class CS312GraphEdge:
         return '(src={} dest={} length={})'.format(self.src,self.dest,self.length)
 
 class CS312GraphNode:
+    __slots__ = ('node_id', 'loc', 'neighbors')
+
     def __init__( self, node_id, node_loc ):
         self.node_id   = node_id
         self.loc       = node_loc
@@ -36,7 +88,11 @@ class CS312Graph:
             neighbors = edgeList[i]
             for n in neighbors:
                 self.nodes[i].addEdge( self.nodes[n[0]], n[1] )
-        
+
+        self.csr = None
+        self.reverse = None
+        self.coords = None
+
     def __str__( self ):
         s = []
         for n in self.nodes:
@@ -44,4 +100,237 @@ class CS312Graph:
         return str(s)
 
     def getNodes( self ):
-        return self.nodes
\ No newline at end of file
+        return self.nodes
+
+    # O(|V| + |E|) time the first time, O(1) afterwards
+    # returns (offsets, targets, weights), see CS312CompactGraph
+    def getCSR( self ):
+        if self.csr == None:
+            offsets = array('q', [0])
+            targets = array('q')
+            weights = array('d')
+            for node in self.nodes:
+                for edge in node.neighbors:
+                    targets.append(edge.dest.node_id)
+                    weights.append(edge.length)
+                offsets.append(len(targets))
+            self.csr = (offsets, targets, weights)
+        return self.csr
+
+    # O(|V| + |E|) time the first time, O(1) afterwards
+    def getReverseCSR( self ):
+        if self.reverse == None: self.reverse = reverseCSR(*self.getCSR())
+        return self.reverse
+
+    # O(out-degree of u + in-degree of v) time
+    # Changes the length of the edge(s) from u to v, in the edge objects and in any CSR
+    # arrays already built from them
+    def setEdgeWeight( self, u, v, weight ):
+        edges = [edge for edge in self.nodes[u].neighbors if edge.dest.node_id == v]
+        if len(edges) == 0: raise ValueError('No edge from {} to {}'.format(u, v))
+        for edge in edges: edge.length = weight
+        if self.csr != None: setCSRWeight(*self.csr, u, v, weight)
+        if self.reverse != None: setCSRWeight(*self.reverse, v, u, weight)
+
+    # O(|V|) time the first time, O(1) afterwards
+    # returns (xs, ys), the node coordinates in node id order
+    def getCoords( self ):
+        if self.coords == None:
+            self.coords = (array('d', [node.loc.x() for node in self.nodes]),
+                           array('d', [node.loc.y() for node in self.nodes]))
+        return self.coords
+
+
+# Stand-in for QPointF when a compact graph is built without the GUI's point objects
+class CS312Point:
+    __slots__ = ('_x', '_y')
+
+    def __init__( self, x, y ):
+        self._x = x
+        self._y = y
+
+    def x( self ):
+        return self._x
+
+    def y( self ):
+        return self._y
+
+    def __repr__( self ):
+        return 'CS312Point({}, {})'.format(self._x, self._y)
+
+# Edge and node views handed out by CS312CompactGraph. They are created on demand
+# and only point back into the graph's arrays.
+class CS312CompactEdge:
+    __slots__ = ('graph', 'index', 'src')
+
+    def __init__( self, graph, index, src ):
+        self.graph = graph
+        self.index = index
+        self.src   = src
+
+    @property
+    def dest( self ):
+        return CS312CompactNode(self.graph, self.graph.targets[self.index])
+
+    @property
+    def length( self ):
+        return self.graph.weights[self.index]
+
+    def __repr__( self ):
+        return self.__str__()
+
+    def __str__( self ):
+        return '(src={} dest={} length={})'.format(self.src,self.dest,self.length)
+
+class CS312CompactNode:
+    __slots__ = ('graph', 'node_id')
+
+    def __init__( self, graph, node_id ):
+        self.graph   = graph
+        self.node_id = node_id
+
+    @property
+    def loc( self ):
+        return self.graph.getLoc(self.node_id)
+
+    @property
+    def neighbors( self ):
+        offsets = self.graph.offsets
+        return [CS312CompactEdge(self.graph, e, self)
+                for e in range(offsets[self.node_id], offsets[self.node_id + 1])]
+
+    def __str__( self ):
+        neighbors = [edge.dest.node_id for edge in self.neighbors]
+        return 'Node(id:{},neighbors:{})'.format(self.node_id,neighbors)
+
+# Read-only sequence of CS312CompactNode views, so code written against
+# CS312Graph.nodes/getNodes() keeps working
+class CS312CompactNodeList:
+    __slots__ = ('graph',)
+
+    def __init__( self, graph ):
+        self.graph = graph
+
+    def __len__( self ):
+        return len(self.graph.offsets) - 1
+
+    def __getitem__( self, i ):
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError('node index out of range')
+        return CS312CompactNode(self.graph, i)
+
+    def __iter__( self ):
+        for i in range(len(self)):
+            yield CS312CompactNode(self.graph, i)
+
+# The same graph as CS312Graph stored in compressed sparse row (CSR) form. The edges
+# leaving node u are targets[offsets[u]:offsets[u + 1]] with the matching weights,
+# and node coordinates live in xs/ys. No per-node or per-edge objects are kept, so
+# a graph costs about 16 bytes per edge and 24 bytes per node.
+class CS312CompactGraph:
+    def __init__( self, nodeList, edgeList ):
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('d')
+        for i in range(len(nodeList)):
+            for n in edgeList[i]:
+                targets.append(n[0])
+                weights.append(n[1])
+            offsets.append(len(targets))
+
+        self._setArrays(array('d', [loc.x() for loc in nodeList]),
+                        array('d', [loc.y() for loc in nodeList]),
+                        offsets, targets, weights, nodeList)
+
+    # Builds a graph directly from CSR arrays. Any indexable sequences work (array,
+    # memoryview, NumPy arrays); locs is an optional list of point objects to hand
+    # out as node.loc instead of CS312Point.
+    @classmethod
+    def fromArrays( cls, xs, ys, offsets, targets, weights, locs=None ):
+        graph = cls.__new__(cls)
+        graph._setArrays(xs, ys, offsets, targets, weights, locs)
+        return graph
+
+    def _setArrays( self, xs, ys, offsets, targets, weights, locs ):
+        self.xs      = xs
+        self.ys      = ys
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.locs    = locs
+        self.nodes   = CS312CompactNodeList(self)
+        self.reverse = None
+
+    def __str__( self ):
+        return str([node.neighbors for node in self.nodes])
+
+    def getNodes( self ):
+        return self.nodes
+
+    def getLoc( self, node_id ):
+        if self.locs != None: return self.locs[node_id]
+        return CS312Point(self.xs[node_id], self.ys[node_id])
+
+    # O(1) time
+    def getCSR( self ):
+        return (self.offsets, self.targets, self.weights)
+
+    # O(|V| + |E|) time the first time, O(1) afterwards
+    def getReverseCSR( self ):
+        if self.reverse == None: self.reverse = reverseCSR(*self.getCSR())
+        return self.reverse
+
+    # O(1) time
+    def getCoords( self ):
+        return (self.xs, self.ys)
+
+    # O(out-degree of u + in-degree of v) time
+    # Changes the length of the edge(s) from u to v. Edges can't be added or removed.
+    def setEdgeWeight( self, u, v, weight ):
+        if setCSRWeight(self.offsets, self.targets, self.weights, u, v, weight) == 0:
+            raise ValueError('No edge from {} to {}'.format(u, v))
+        if self.reverse != None: setCSRWeight(*self.reverse, v, u, weight)
+
+
+# Binary graph files. After a 24 byte header (GRAPH_MAGIC, the number of nodes, the
+# number of edges) come xs, ys, offsets, targets and weights, one after the other, each
+# an array of 8 byte little-endian values exactly as CS312CompactGraph keeps them. So
+# loading is just a memory map with each array viewed in place, and every process that
+# loads the same file shares its pages.
+GRAPH_MAGIC = b'CS312G\x00\x01'
+GRAPH_HEADER = struct.Struct('<8sqq')
+GRAPH_ARRAYS = 'ddqqd' # typecodes of xs, ys, offsets, targets, weights
+
+# O(|V| + |E|) time
+# Writes a CS312Graph or CS312CompactGraph to path
+def saveGraph( graph, path ):
+    if sys.byteorder != 'little': raise ValueError('Graph files are only supported on little-endian machines')
+    offsets, targets, weights = graph.getCSR()
+    xs, ys = graph.getCoords()
+    with open(path, 'wb') as f:
+        f.write(GRAPH_HEADER.pack(GRAPH_MAGIC, len(offsets) - 1, len(targets)))
+        for typecode, values in zip(GRAPH_ARRAYS, (xs, ys, offsets, targets, weights)):
+            if not isinstance(values, array) or values.typecode != typecode: values = array(typecode, values)
+            f.write(values)
+
+# O(1) time, the arrays are paged in from disk as they're used
+# Opens a file written by saveGraph as a CS312CompactGraph. The mapping is copy-on-write,
+# so changing an edge weight afterwards never touches the file.
+def loadGraph( path ):
+    if sys.byteorder != 'little': raise ValueError('Graph files are only supported on little-endian machines')
+    with open(path, 'rb') as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    if len(data) < GRAPH_HEADER.size: raise ValueError('{} is not a graph file'.format(path))
+    magic, numNodes, numEdges = GRAPH_HEADER.unpack_from(data)
+    lengths = (numNodes, numNodes, numNodes + 1, numEdges, numEdges)
+    if magic != GRAPH_MAGIC or len(data) != GRAPH_HEADER.size + 8 * sum(lengths):
+        raise ValueError('{} is not a graph file'.format(path))
+
+    arrays = []
+    start = GRAPH_HEADER.size
+    view = memoryview(data)
+    for typecode, length in zip(GRAPH_ARRAYS, lengths):
+        arrays.append(view[start:start + 8 * length].cast(typecode))
+        start += 8 * length
+    return CS312CompactGraph.fromArrays(*arrays)
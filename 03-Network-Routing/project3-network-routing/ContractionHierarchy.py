@@ -0,0 +1,306 @@
+from array import array
+from heapq import heappush, heappop
+import time
+
+
+# A witness search gives up after settling this many nodes. Giving up early only means
+# a shortcut gets added that wasn't strictly needed, never a wrong answer.
+WITNESS_SETTLE_LIMIT = 60
+# Contraction stops once the nodes that are left average this many out-edges. The
+# generated networks connect random pairs of nodes, so the remaining graph fills in
+# quickly towards the end and contracting it would cost O(|V|^2) shortcuts.
+CORE_DEGREE = 4
+
+
+# Core-based Contraction Hierarchies for the routing graphs. Preprocessing removes
+# ("contracts") the nodes one at a time, least important first, and adds a shortcut
+# edge u -> x of length w(u,v) + w(v,x) whenever contracting v would otherwise destroy
+# the only shortest u -> x path. It stops at coreDegree rather than contracting every
+# node, and the nodes left over form the core, coreSize of them. A query searches
+# upwards (towards later contracted nodes) from both ends until it reaches the core,
+# then runs bidirectional Dijkstra inside it; numCoreSettled is how many of the nodes
+# it settled were in the core. coreDegree=float('inf') contracts every node, as in
+# plain Contraction Hierarchies, but the random networks here have no hierarchy for it
+# to find: the shortcuts fill the graph in and make both the preprocessing and the
+# queries slower. With CORE_DEGREE about two thirds of their nodes stay in the core.
+#
+# The index is two CSR graphs with the same layout as CS312CompactGraph: up[u] holds
+# the edges u -> x with rank[x] > rank[u], and down[x] holds the edges u -> x with
+# rank[u] > rank[x], stored under x so the backward search can scan them. Every edge
+# also keeps the contracted node it bypasses (-1 for an original edge), which is how
+# shortcuts get unpacked back into original edges.
+#
+# The nodes still left when contraction stops (see CORE_DEGREE) form the core. They are
+# ranked above everything else, in no particular order, and the edges between them are
+# kept in both up and down, so a query runs plain bidirectional Dijkstra once it's in
+# the core.
+class ContractionHierarchy:
+    def __init__( self, network, witnessLimit=WITNESS_SETTLE_LIMIT, coreDegree=CORE_DEGREE ):
+        self.network = network
+        self.witnessLimit = witnessLimit
+        self.coreDegree = coreDegree
+        self.numCoreSettled = 0
+
+        t1 = time.time()
+        self._preprocess()
+        t2 = time.time()
+        self.preprocessTime = t2 - t1
+
+    # Roughly O(|V| * d^2 * witnessLimit * log) time, d being the degree of the
+    # remaining graph when a node gets contracted
+    def _preprocess( self ):
+        offsets, targets, weights = self.network.getCSR()
+        numNodes = len(offsets) - 1
+
+        # the graph that's left, as node -> {neighbor: (length, bypassed node)}
+        outEdges = [{} for _ in range(numNodes)]
+        inEdges = [{} for _ in range(numNodes)]
+        for u in range(numNodes):
+            for e in range(offsets[u], offsets[u + 1]):
+                v = targets[e]
+                if v != u and weights[e] < outEdges[u].get(v, (float('inf'),))[0]:
+                    outEdges[u][v] = (weights[e], -1)
+                    inEdges[v][u] = (weights[e], -1)
+
+        self.rank = array('q', [0]) * numNodes
+        upEdges = [None] * numNodes
+        downEdges = [None] * numNodes
+        contractedNeighbors = [0] * numNodes
+        self.numShortcuts = 0
+
+        # lazy updates: a node's priority is only recomputed when it reaches the top
+        pQueue = []
+        for v in range(numNodes):
+            shortcuts = self._findShortcuts(v, outEdges, inEdges)
+            heappush(pQueue, (self._priority(v, shortcuts, outEdges, inEdges, contractedNeighbors), v))
+
+        contracted = bytearray(numNodes)
+        nextRank = 0
+        numEdges = sum(len(edges) for edges in outEdges)
+        while pQueue and numEdges <= self.coreDegree * (numNodes - nextRank):
+            _, v = heappop(pQueue)
+            if contracted[v]: continue
+            shortcuts = self._findShortcuts(v, outEdges, inEdges)
+            priority = self._priority(v, shortcuts, outEdges, inEdges, contractedNeighbors)
+            if pQueue and priority > pQueue[0][0]:
+                heappush(pQueue, (priority, v))
+                continue
+
+            # contract v: everything still attached to it is ranked higher
+            contracted[v] = 1
+            self.rank[v] = nextRank
+            nextRank += 1
+            upEdges[v] = outEdges[v]
+            downEdges[v] = inEdges[v]
+            numEdges -= len(outEdges[v]) + len(inEdges[v])
+            for x in outEdges[v]:
+                del inEdges[x][v]
+                contractedNeighbors[x] += 1
+            for u in inEdges[v]:
+                del outEdges[u][v]
+                contractedNeighbors[u] += 1
+            outEdges[v] = None
+            inEdges[v] = None
+
+            for u, x, length in shortcuts:
+                if length < outEdges[u].get(x, (float('inf'),))[0]:
+                    if not x in outEdges[u]:
+                        self.numShortcuts += 1
+                        numEdges += 1
+                    outEdges[u][x] = (length, v)
+                    inEdges[x][u] = (length, v)
+
+        # what's left is the core
+        self.coreSize = numNodes - nextRank
+        for v in range(numNodes):
+            if not contracted[v]:
+                self.rank[v] = nextRank
+                nextRank += 1
+                upEdges[v] = outEdges[v]
+                downEdges[v] = inEdges[v]
+
+        self.up = self._toCSR(upEdges)
+        self.down = self._toCSR(downEdges)
+
+    # The shortcuts (u, x, length) contracting v would need: one for every path
+    # u -> v -> x that no other path of the same length or shorter can replace.
+    def _findShortcuts( self, v, outEdges, inEdges ):
+        shortcuts = []
+        for u, (inLength, _) in inEdges[v].items():
+            maxLength = max((inLength + outLength for x, (outLength, _) in outEdges[v].items() if x != u),
+                            default=None)
+            if maxLength == None: continue
+            witnessDists = self._witnessSearch(u, v, maxLength, outEdges, len(outEdges[v]))
+            for x, (outLength, _) in outEdges[v].items():
+                if x != u and witnessDists.get(x, float('inf')) > inLength + outLength:
+                    shortcuts.append((u, x, inLength + outLength))
+        return shortcuts
+
+    # Dijkstra from source in the remaining graph without excluded, stopping at maxLength,
+    # after witnessLimit nodes, or once every out-neighbor of excluded has been settled.
+    # Returns the distances found, some only upper bounds.
+    def _witnessSearch( self, source, excluded, maxLength, outEdges, numTargets ):
+        targets = outEdges[excluded]
+        distances = {source: 0.0}
+        pQueue = [(0.0, source)]
+        numSettled = 0
+        while pQueue and numSettled < self.witnessLimit and numTargets > 0:
+            currDist, currSrc = heappop(pQueue)
+            if currDist > distances[currSrc]: continue
+            if currDist > maxLength: break
+            numSettled += 1
+            if currSrc in targets: numTargets -= 1
+            for currDest, (length, _) in outEdges[currSrc].items():
+                if currDest == excluded: continue
+                newDist = currDist + length
+                if newDist < distances.get(currDest, float('inf')):
+                    distances[currDest] = newDist
+                    heappush(pQueue, (newDist, currDest))
+        return distances
+
+    # edge difference plus the number of neighbors already contracted, which spreads
+    # the contraction evenly over the graph
+    def _priority( self, v, shortcuts, outEdges, inEdges, contractedNeighbors ):
+        return len(shortcuts) - len(outEdges[v]) - len(inEdges[v]) + contractedNeighbors[v]
+
+    # turns a list of {neighbor: (length, bypassed node)} into CSR arrays
+    def _toCSR( self, edgeDicts ):
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('d')
+        middles = array('q')
+        for edges in edgeDicts:
+            for x, (length, middle) in edges.items():
+                targets.append(x)
+                weights.append(length)
+                middles.append(middle)
+            offsets.append(len(targets))
+        return (offsets, targets, weights, middles)
+
+    # size of the index in bytes
+    def numBytes( self ):
+        arrays = list(self.up) + list(self.down) + [self.rank]
+        return sum(len(a) * a.itemsize for a in arrays)
+
+    # Returns (length, path as a list of node ids, number of settled nodes) for the
+    # shortest path from srcIndex to destIndex, or (inf, [], settled) if there is none.
+    # The length is summed along the original edges from srcIndex, so it comes out
+    # exactly as Dijkstra computes it.
+    def query( self, srcIndex, destIndex ):
+        self.numCoreSettled = 0
+        if srcIndex == destIndex: return 0, [srcIndex], 0
+
+        graphs = (self.up, self.down)
+        coreRank = len(self.rank) - self.coreSize
+        distances = ({srcIndex: 0.0}, {destIndex: 0.0})
+        prevNodes = ({srcIndex: None}, {destIndex: None})
+        best = float('inf')
+        meetNode = None
+        numSettled = 0
+
+        # Upward searches from both ends up to the core. They're run to the end, since
+        # the part of the hierarchy below a node is small; the core nodes they reach are
+        # where the core search starts from.
+        coreQueues = ([], [])
+        for side, start in ((0, srcIndex), (1, destIndex)):
+            offsets, targets, weights, _ = graphs[side]
+            dists, prev = distances[side], prevNodes[side]
+            pQueue = [(0.0, start)]
+            while pQueue:
+                currDist, currSrc = heappop(pQueue)
+                if currDist > dists[currSrc]: continue
+                numSettled += 1
+                if self.rank[currSrc] >= coreRank:
+                    coreQueues[side].append((currDist, currSrc))
+                    continue
+                for e in range(offsets[currSrc], offsets[currSrc + 1]):
+                    currDest = targets[e]
+                    newDist = currDist + weights[e]
+                    if newDist < dists.get(currDest, float('inf')):
+                        dists[currDest] = newDist
+                        prev[currDest] = currSrc
+                        heappush(pQueue, (newDist, currDest))
+
+        # the best path that stays below the core peaks at a node both searches reached
+        for node, currDist in distances[0].items():
+            otherDist = distances[1].get(node)
+            if otherDist != None and currDist + otherDist < best:
+                best = currDist + otherDist
+                meetNode = node
+
+        # Bidirectional Dijkstra in the core, started from every core node each side got
+        # to. Both searches now run on the same graph, so they can stop as soon as their
+        # two queue minima add up to best.
+        pQueues = coreQueues
+        for pQueue in pQueues: pQueue.sort()
+        side = 0
+        while pQueues[0] and pQueues[1] and pQueues[0][0][0] + pQueues[1][0][0] < best:
+            pQueue = pQueues[side]
+            dists, prev = distances[side], prevNodes[side]
+            currDist, currSrc = heappop(pQueue)
+            if currDist > dists[currSrc]: continue
+            numSettled += 1
+            self.numCoreSettled += 1
+
+            offsets, targets, weights, _ = graphs[side]
+            otherDists = distances[1 - side]
+            for e in range(offsets[currSrc], offsets[currSrc + 1]):
+                currDest = targets[e]
+                newDist = currDist + weights[e]
+                if newDist < dists.get(currDest, float('inf')):
+                    dists[currDest] = newDist
+                    prev[currDest] = currSrc
+                    heappush(pQueue, (newDist, currDest))
+                    otherDist = otherDists.get(currDest)
+                    if otherDist != None and newDist + otherDist < best:
+                        best = newDist + otherDist
+                        meetNode = currDest
+            side = 1 - side
+
+        if meetNode == None: return float('inf'), [], numSettled
+
+        # upward path srcIndex -> meetNode, then meetNode -> destIndex, shortcuts unpacked
+        path = []
+        currNode = meetNode
+        while currNode != None:
+            path.append(currNode)
+            currNode = prevNodes[0][currNode]
+        path.reverse()
+        currNode = prevNodes[1][meetNode]
+        while currNode != None:
+            path.append(currNode)
+            currNode = prevNodes[1][currNode]
+        path = self._unpack(path)
+
+        length = 0
+        for i in range(len(path) - 1):
+            length += self._originalLength(path[i], path[i + 1])
+        return length, path, numSettled
+
+    # replaces every shortcut in a path with the two edges it stands for, recursively
+    def _unpack( self, path ):
+        unpacked = [path[0]]
+        stack = [(path[i], path[i + 1]) for i in range(len(path) - 2, -1, -1)]
+        while stack:
+            u, x = stack.pop()
+            middle = self._edge(u, x)[1]
+            if middle == -1: unpacked.append(x)
+            else:
+                stack.append((middle, x))
+                stack.append((u, middle))
+        return unpacked
+
+    # (length, bypassed node) of the index edge u -> x, which lives with whichever
+    # endpoint was contracted first (with both, if they're in the core)
+    def _edge( self, u, x ):
+        if self.rank[u] < self.rank[x]: owner, other, graph = u, x, self.up
+        else: owner, other, graph = x, u, self.down
+        offsets, targets, weights, middles = graph
+        for e in range(offsets[owner], offsets[owner + 1]):
+            if targets[e] == other: return weights[e], middles[e]
+        raise KeyError((u, x))
+
+    # length of the shortest original edge u -> x
+    def _originalLength( self, u, x ):
+        offsets, targets, weights = self.network.getCSR()
+        return min(weights[e] for e in range(offsets[u], offsets[u + 1]) if targets[e] == x)
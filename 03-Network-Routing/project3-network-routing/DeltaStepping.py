@@ -0,0 +1,173 @@
+from multiprocessing import Pool
+
+import numpy as np
+
+from CS312Graph import expandRanges
+from SharedArrays import *
+
+
+# Delta-stepping (Meyer and Sanders) single-source shortest paths. Tentative distances
+# are grouped into buckets of width delta, and the lowest non-empty bucket is emptied in
+# phases: all of its nodes relax their light edges (length <= delta) at once, which can
+# put nodes back into the same bucket, until the bucket stays empty, and then the nodes
+# it held relax their heavy edges once. Each phase is a handful of NumPy operations over
+# the whole frontier instead of one heap operation per node, and the frontier can be
+# split between worker processes.
+#
+# The distances come out exactly as Dijkstra computes them: both end with every distance
+# equal to the smallest d[u] + length(u, v) over its in-edges. prevNodes is then worked
+# out from the distances, picking the in-neighbor Dijkstra would have settled first.
+
+
+# Frontiers with fewer edges than this are relaxed in the parent even when there is a
+# pool, since sending them to the workers would take longer than relaxing them
+PARALLEL_MIN_EDGES = 200000
+
+# O(|E|) time
+# Default bucket width: the average edge length. The textbook choice (about one light edge
+# per node) makes for many small phases, and with NumPy a phase costs about the same no
+# matter its size, so wider buckets do better here even though they redo more relaxations.
+def defaultDelta( weights ):
+    if len(weights) == 0: return 1.0
+    return float(np.mean(weights))
+
+def _relaxChunk( task ):
+    nodes, delta, light = task
+    return _relax(*worker['arrays'], nodes, delta, light)
+
+# O(edges out of nodes) time
+# Relaxes the light (or heavy) edges out of nodes against distances, without changing
+# them. Returns (targets, new distances, sources) for the edges that improve a distance,
+# only the best one for each target.
+def _relax( offsets, targets, weights, distances, nodes, delta, light ):
+    starts = offsets[nodes]
+    counts = offsets[nodes + 1] - starts
+    edgeIds = expandRanges(starts, counts)
+    sources = np.repeat(nodes, counts)
+
+    lengths = weights[edgeIds]
+    keep = lengths <= delta if light else lengths > delta
+    edgeIds, sources, lengths = edgeIds[keep], sources[keep], lengths[keep]
+    dests = targets[edgeIds]
+    newDists = distances[sources] + lengths
+
+    better = newDists < distances[dests]
+    return _bestPerTarget(dests[better], newDists[better], sources[better])
+
+# keeps the smallest distance for each target
+def _bestPerTarget( dests, newDists, sources ):
+    order = np.lexsort((newDists, dests))
+    dests, newDists, sources = dests[order], newDists[order], sources[order]
+    first = np.ones(len(dests), dtype=bool)
+    first[1:] = dests[1:] != dests[:-1]
+    return dests[first], newDists[first], sources[first]
+
+
+# Runs delta-stepping on a CS312Graph or CS312CompactGraph. With numWorkers > 1 the
+# graph and the distances live in shared memory and big frontiers are split over a
+# process pool; call close() (or use a with block) to shut it down. Needs NumPy.
+class DeltaStepping:
+    def __init__( self, network, delta=None, numWorkers=1 ):
+        offsets, targets, weights = network.getCSR()
+        arrays = [np.asarray(offsets, dtype=np.int64), np.asarray(targets, dtype=np.int64),
+                  np.asarray(weights, dtype=np.float64), np.empty(len(offsets) - 1)]
+        self.numWorkers = numWorkers
+        self.delta = defaultDelta(arrays[2]) if delta == None else delta
+        self.pool = None
+        self.blocks = []
+
+        if numWorkers > 1:
+            # the workers map the same arrays, the parent keeps writing the distances
+            specs = []
+            for i, values in enumerate(arrays):
+                block, arrays[i], spec = shareArray(values, values.dtype)
+                self.blocks.append(block)
+                specs.append(spec)
+            self.pool = Pool(numWorkers, initializer=attachArrays, initargs=(specs,))
+
+        self.offsets, self.targets, self.weights, self.distances = arrays
+
+    def __enter__( self ):
+        return self
+
+    def __exit__( self, *args ):
+        self.close()
+
+    def close( self ):
+        if self.pool != None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        # the arrays over the blocks have to go before the blocks can be closed
+        self.offsets = self.targets = self.weights = self.distances = None
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+    # Returns (distances, prevNodes, number of phases) from srcIndex as NumPy arrays,
+    # prevNodes holding -1 for the source and for unreachable nodes
+    def shortestPaths( self, srcIndex ):
+        distances, delta = self.distances, self.delta
+        distances.fill(np.inf)
+        distances[srcIndex] = 0
+
+        pending = np.array([srcIndex]) # nodes with a distance that haven't been settled
+        numPhases = 0
+        while len(pending) > 0:
+            buckets = np.floor(distances[pending] / delta)
+            currBucket = buckets.min()
+            inBucket = buckets == currBucket
+            frontier = pending[inBucket]
+            pending = pending[~inBucket]
+            bucketEnd = (currBucket + 1) * delta
+
+            # light edges until nothing lands in this bucket any more
+            emptied = [frontier]
+            while len(frontier) > 0:
+                dests, newDists, _ = self._relax(frontier, True)
+                distances[dests] = newDists
+                stays = newDists < bucketEnd
+                frontier = dests[stays]
+                emptied.append(frontier)
+                pending = np.union1d(pending, dests[~stays])
+                numPhases += 1
+
+            # then the heavy edges of everything the bucket held, which all land later
+            emptied = np.unique(np.concatenate(emptied))
+            dests, newDists, _ = self._relax(emptied, False)
+            distances[dests] = newDists
+            pending = np.setdiff1d(np.union1d(pending, dests), emptied, assume_unique=True)
+            numPhases += 1
+
+        return distances.copy(), self._prevNodes(srcIndex), numPhases
+
+    # _relax, split over the pool when the frontier has enough edges
+    def _relax( self, nodes, light ):
+        offsets = self.offsets
+        if self.pool == None or (offsets[nodes + 1] - offsets[nodes]).sum() < PARALLEL_MIN_EDGES:
+            return _relax(offsets, self.targets, self.weights, self.distances, nodes, self.delta, light)
+
+        chunks = np.array_split(nodes, self.numWorkers)
+        results = self.pool.map(_relaxChunk, [(chunk, self.delta, light) for chunk in chunks])
+        return _bestPerTarget(*(np.concatenate(parts) for parts in zip(*results)))
+
+    # O(|E|) time
+    # Dijkstra sets prevNodes[v] to the first u whose edge brings v to its final distance,
+    # and it settles nodes in order of distance, so that's the u with the smallest
+    # distance among those with distances[u] + length(u, v) == distances[v]
+    def _prevNodes( self, srcIndex ):
+        offsets, targets, weights, distances = self.offsets, self.targets, self.weights, self.distances
+        sources = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+        tight = np.isfinite(distances[sources]) & (distances[sources] + weights == distances[targets])
+        sources, dests = sources[tight], targets[tight]
+
+        order = np.lexsort((distances[sources], dests))
+        sources, dests = sources[order], dests[order]
+        first = np.ones(len(dests), dtype=bool)
+        first[1:] = dests[1:] != dests[:-1]
+
+        prevNodes = np.full(len(distances), -1, dtype=np.int64)
+        prevNodes[dests[first]] = sources[first]
+        prevNodes[srcIndex] = -1
+        return prevNodes
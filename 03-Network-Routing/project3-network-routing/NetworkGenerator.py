@@ -0,0 +1,106 @@
+import math
+import random
+from array import array
+
+from CS312Graph import *
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+OUT_DEGREE = 3
+# the data range Proj3GUI.initUI sets up
+DATA_RANGE = {'x': [-2.0, 2.0], 'y': [-1.0, 1.0]}
+
+
+# The random networks Proj3GUI draws: size points spread uniformly over dataRange, each
+# with edges to outDegree other distinct points chosen uniformly at random, as long as
+# the straight line between them (times 100).
+#
+# newPoints/randomEdges are the reference generator the GUI uses. It draws from Python's
+# random one value at a time, so a seed always gives the same graph as it always has.
+# generateCompactNetwork draws the same kind of graph in bulk with NumPy, but the random
+# numbers come out in a different order, so a seed doesn't give the same graph as the
+# reference generator.
+
+
+# O(|V|) time
+# pointType builds a point from x and y, e.g. QPointF in the GUI
+def newPoints( size, seed=0, dataRange=DATA_RANGE, pointType=CS312Point ):
+    random.seed(seed)
+    xr = dataRange['x']
+    yr = dataRange['y']
+    ptlist = []
+    while len(ptlist) < size:
+        x = random.uniform(0.0, 1.0)
+        y = random.uniform(0.0, 1.0)
+        ptlist.append(pointType(xr[0] + (xr[1]-xr[0])*x, yr[0] + (yr[1]-yr[0])*y))
+    return ptlist
+
+# O(|V| * outDegree) expected time
+# Returns the edgeList CS312Graph takes. Carries on with the random state newPoints left,
+# so it has to be called right after it.
+def randomEdges( nodes, outDegree=OUT_DEGREE ):
+    size = len(nodes)
+    edgeList = {}
+    for u in range(size):
+        edgeList[u] = []
+        pt_u = nodes[u]
+        chosen = set()
+        for i in range(outDegree):
+            v = random.randint(0, size-1)
+            while v in chosen or v == u:
+                v = random.randint(0, size-1)
+            chosen.add(v)
+            pt_v = nodes[v]
+            uv_len = math.sqrt((pt_v.x()-pt_u.x())**2 +
+                               (pt_v.y()-pt_u.y())**2)
+            edgeList[u].append((v, 100.0*uv_len))
+        edgeList[u] = sorted(edgeList[u], key=lambda n: n[0])
+    return edgeList
+
+# Returns the nodeList and edgeList that CS312Graph takes, the same as Proj3GUI makes
+# for the same seed
+def generateNetwork( size, seed=0, outDegree=OUT_DEGREE, dataRange=DATA_RANGE, pointType=CS312Point ):
+    nodes = newPoints(size, seed, dataRange, pointType)
+    return nodes, randomEdges(nodes, outDegree)
+
+# O(|V| * outDegree) time, all of it in NumPy
+# Draws a network like generateNetwork straight into a CS312CompactGraph. Needs NumPy.
+def generateCompactNetwork( size, seed=0, outDegree=OUT_DEGREE, dataRange=DATA_RANGE ):
+    if np is None: raise ImportError('generateCompactNetwork needs NumPy')
+    if size <= outDegree: raise ValueError('Need more than {} nodes'.format(outDegree))
+
+    rng = np.random.default_rng(seed)
+    xr = dataRange['x']
+    yr = dataRange['y']
+    xs = xr[0] + (xr[1]-xr[0])*rng.random(size)
+    ys = yr[0] + (yr[1]-yr[0])*rng.random(size)
+
+    # one of the other size - 1 nodes for each edge: drawing from 0..size-2 and moving
+    # anything at or past u up by one skips u. Rows that picked a node twice are drawn
+    # again, which only happens to about outDegree^2 / size of them.
+    nodeIds = np.arange(size)
+    targets = rng.integers(0, size - 1, (size, outDegree))
+    targets += targets >= nodeIds[:, None]
+    targets.sort(axis=1)
+    repeats = np.flatnonzero((targets[:, 1:] == targets[:, :-1]).any(axis=1))
+    while len(repeats) > 0:
+        redrawn = rng.integers(0, size - 1, (len(repeats), outDegree))
+        redrawn += redrawn >= repeats[:, None]
+        redrawn.sort(axis=1)
+        targets[repeats] = redrawn
+        repeats = repeats[(redrawn[:, 1:] == redrawn[:, :-1]).any(axis=1)]
+
+    dx = xs[targets] - xs[:, None]
+    dy = ys[targets] - ys[:, None]
+    weights = 100.0*np.sqrt(dx**2 + dy**2)
+    offsets = np.arange(0, size*outDegree + 1, outDegree, dtype=np.int64)
+
+    # copied into plain arrays, which are much faster to index one element at a time
+    return CS312CompactGraph.fromArrays(array('d', xs.tobytes()), array('d', ys.tobytes()),
+                                        array('q', offsets.tobytes()),
+                                        array('q', targets.astype(np.int64).tobytes()),
+                                        array('d', weights.tobytes()))
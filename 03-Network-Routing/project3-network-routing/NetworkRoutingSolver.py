@@ -1,89 +1,634 @@
 # !/usr/bin/python3
 
 
+from array import array
 from CS312Graph import *
+from heapq import heappush, heappop, nsmallest
+import math
 import time
 from PriorityQueue import *
+from ShortestPathCache import *
+from ContractionHierarchy import *
+from SpatialIndex import *
+
+
+# Point-to-point search methods shortestPath() can use
+SEARCH_METHODS = ('dijkstra', 'astar', 'bidirectional', 'ch')
 
 
 class NetworkRoutingSolver:
-    def __init__( self ): pass
+    # cacheBytes is the memory budget for cached shortest-path trees, 0 turns caching off
+    def __init__( self, cacheBytes=DEFAULT_CACHE_BYTES ):
+        self.cache = ShortestPathCache(cacheBytes)
 
     def initializeNetwork( self, network ):
-        assert( type(network) == CS312Graph )
+        assert( type(network) == CS312Graph or type(network) == CS312CompactGraph )
         self.network = network
+        self.heuristicScale = None
+        self.minEdgeLength = None
+        self.hierarchy = None
+        # the nodes don't move, so this is built once per network; changing edge weights doesn't touch it
+        self.spatialIndex = SpatialIndex(*network.getCoords())
+        self.queueStats = None
+        self.completeTree = False
+        self.cache.clear() # trees from the old network are meaningless now
+        # getPathNodes writes paths in here, no path can be longer
+        self.pathBuffer = array('q', [0]) * len(network.getNodes())
+
+    # queue picks the priority queue by name (a key of QUEUE_TYPES) or is a callable
+    # that builds one from the number of nodes, e.g. lambda n: DaryHeapQueue(n, d=8).
+    # 'radix' and 'dial' need the values they get to never go below the last one taken
+    # out, which holds for every search here.
+    # When it's left out, use_heap chooses between HeapQueue and ArrayQueue.
+    # With useCache, a tree already computed for srcIndex is reused, and a newly computed
+    # one is kept for later; pass False to always run the search (e.g. when timing it).
+    # With instrument, queueStats afterwards holds a QueueStats (see PriorityQueue.py) with
+    # the queue operations the search made and the time they took, which makes the search
+    # itself slower; otherwise it's None and the queue runs as it is.
+    def computeShortestPaths( self, srcIndex, use_heap=False, queue=None, useCache=True, instrument=False ):
 
-    def computeShortestPaths( self, srcIndex, use_heap=False ):
+        if queue == None: queue = 'heap' if use_heap else 'array'
 
         self.source = srcIndex
+        self.queueStats = QueueStats() if instrument else None
+        self.completeTree = True
         t1 = time.time()
 
-        self._dijkstra(srcIndex, use_heap)
+        if not (useCache and self._loadCachedTree(srcIndex)):
+            self._dijkstra(srcIndex, queue)
+            if useCache and self.cache.maxBytes > 0:
+                tree = self.cache.put(srcIndex, self.distances, self.prevNodes)
+                self.distances, self.prevNodes = tree.distances, tree.prevNodes
         
         t2 = time.time()
         return (t2-t1)
+
+    # Distances from every node in sources to every node, computed in parallel and
+    # returned as a len(sources) x |V| NumPy memmap, see BatchRouting.py. Unlike
+    # computeShortestPaths this leaves distances/prevNodes and the cache alone.
+    def computeManySources( self, sources, path=None, numWorkers=None, onRow=None ):
+        from BatchRouting import computeManySources # needs NumPy, so only imported when used
+        return computeManySources(self.network, sources, path, numWorkers, onRow)
+
+    # Same as computeShortestPaths, but with delta-stepping, see DeltaStepping.py: the
+    # distances and prevNodes come out the same, with prevNodes in the form cached trees
+    # use (-1 for no previous node). numWorkers > 1 relaxes big frontiers on a pool of
+    # that many processes; delta defaults to the average edge length. numSettled is the
+    # number of bucket phases. Needs NumPy.
+    def computeShortestPathsDeltaStepping( self, srcIndex, numWorkers=1, delta=None ):
+        from DeltaStepping import DeltaStepping # needs NumPy, so only imported when used
+
+        self.source = srcIndex
+        self.queueStats = None
+        self.completeTree = True
+        t1 = time.time()
+
+        with DeltaStepping(self.network, delta, numWorkers) as engine:
+            distances, prevNodes, self.numSettled = engine.shortestPaths(srcIndex)
+        self.distances = array('d', distances.tobytes())
+        self.prevNodes = array('q', prevNodes.tobytes())
+
+        t2 = time.time()
+        return (t2-t1)
+
+    # O(1) time
+    # points distances/prevNodes at the cached tree for srcIndex, if there is one
+    def _loadCachedTree( self, srcIndex ):
+        tree = self.cache.get(srcIndex)
+        if tree == None: return False
+        self.distances, self.prevNodes, self.numSettled = tree.distances, tree.prevNodes, 0
+        return True
+
+    # Same as computeShortestPaths, but the search stops as soon as destIndex is settled,
+    # so only getShortestPath(destIndex) is meaningful afterwards. method is one of
+    # SEARCH_METHODS: plain Dijkstra, A* with a straight-line distance heuristic,
+    # Dijkstra run from both ends at once, or a Contraction Hierarchies query (the
+    # hierarchy gets built on first use, see buildContractionHierarchy).
+    # With useCache, a full tree computeShortestPaths cached for srcIndex answers the query
+    # directly. The search itself is never cached, since it only finds part of the tree.
+    # instrument works as for computeShortestPaths; the two searches of 'bidirectional'
+    # add up into the same QueueStats, and 'ch' doesn't use the queues at all.
+    def shortestPath( self, srcIndex, destIndex, use_heap=False, queue=None, method='dijkstra',
+                      useCache=True, instrument=False ):
+
+        if queue == None: queue = 'heap' if use_heap else 'array'
+
+        self.source = srcIndex
+        self.queueStats = QueueStats() if instrument else None
+        t1 = time.time()
+
+        self.completeTree = useCache and self._loadCachedTree(srcIndex)
+        if not self.completeTree:
+            if method == 'dijkstra': self._dijkstra(srcIndex, queue, destIndex)
+            elif method == 'astar': self._dijkstra(srcIndex, queue, destIndex, self._straightLineHeuristic(destIndex))
+            elif method == 'bidirectional': self._bidirectional(srcIndex, destIndex, queue)
+            elif method == 'ch': self._contractionQuery(srcIndex, destIndex)
+            else: raise ValueError('Unknown search method: {}'.format(method))
+
+        t2 = time.time()
+        return (t2-t1)
+
+    def _makeQueue( self, queue, numNodes ):
+        if callable(queue): pQueue = queue(numNodes)
+        # Dial's buckets are as wide as the shortest edge
+        elif queue == 'dial': pQueue = DialQueue(numNodes, self._getMinEdgeLength())
+        else: pQueue = QUEUE_TYPES[queue](numNodes)
+        if self.queueStats != None: instrumentQueue(pQueue, self.queueStats)
+        return pQueue
+
+    # O(1) expected time
+    # id of the node nearest to the point (x, y), for routing between coordinates
+    def nearestNode( self, x, y ):
+        return self.spatialIndex.nearest(x, y)[0]
+
+    # O(|E|) time the first time, O(1) afterwards
+    def _getMinEdgeLength( self ):
+        if self.minEdgeLength == None:
+            weights = self.network.getCSR()[2]
+            self.minEdgeLength = min((w for w in weights if w > 0), default=1.0)
+        return self.minEdgeLength
     
-    def _dijkstra( self, srcIndex, heapImpl ):
+    def _dijkstra( self, srcIndex, queue, destIndex=None, heuristic=None ):
+        self.distances, self.prevNodes, self.numSettled = self._search(srcIndex, queue, destIndex, heuristic)
+
+    # returns (distances, prevNodes, number of settled nodes)
+    # With a heuristic, a function giving a lower bound on the distance from a node to
+    # destIndex, this is A*: nodes come out of the queue ordered by their distance so far
+    # plus the heuristic, instead of the distance alone.
+    def _search( self, srcIndex, queue, destIndex=None, heuristic=None ):
 
-        allNodes = self.network.nodes # O(|V|) time, O(|V|) space
+        # the out-edges of node u are targets[offsets[u]:offsets[u + 1]], see CS312CompactGraph
+        offsets, targets, weights = self.network.getCSR()
+        numNodes = len(offsets) - 1
 
-        if heapImpl: # see HeapQueue
-            pQueue = HeapQueue(len(allNodes))
-        else: # see ArrayQueue
-            pQueue = ArrayQueue(len(allNodes))
+        pQueue = self._makeQueue(queue, numNodes) # see PriorityQueue.py
         
         # O(|V|) time, O(|V|) space
-        self.distances = [float('inf') for _ in range(len(allNodes))]
-        self.distances[srcIndex] = 0
-        self.prevNodes = {node.node_id: None for node in self.network.getNodes()}
+        distances = [float('inf')] * numNodes
+        distances[srcIndex] = 0
+        prevNodes = [None] * numNodes
 
-        # time: O(|V|) * insert() time; space: O(1) * insert()
-        for node in allNodes: pQueue.insert(node.node_id, self.distances[node.node_id])
+        # nodes go into the queue when they are first reached rather than all up front
+        # at infinity, so a search that stops early never touches the rest of the graph
+        pQueue.insert(srcIndex, 0 if heuristic == None else heuristic(srcIndex))
+        numSettled = 0
 
         while pQueue.size != 0: # loop |V| times
             currSrc = pQueue.deleteMin() # O(1) * deleteMin() time and space
+            numSettled += 1
+            if currSrc == destIndex: break
+            currDist = distances[currSrc]
 
             # loops |E| times total, disregarding the outer loop
-            for edge in allNodes[currSrc].neighbors:
-                currDest = edge.dest.node_id
-                if self.distances[currSrc] + edge.length < self.distances[currDest]:
-                    self.distances[currDest] = self.distances[currSrc] + edge.length
-                    self.prevNodes[currDest] = currSrc
+            for edgeIndex in range(offsets[currSrc], offsets[currSrc + 1]):
+                currDest = targets[edgeIndex]
+                newDist = currDist + weights[edgeIndex]
+                if newDist < distances[currDest]:
+                    key = newDist if heuristic == None else newDist + heuristic(currDest)
+                    # O(1) * insert() or decrease() time and space
+                    if distances[currDest] == float('inf'): pQueue.insert(currDest, key)
+                    else: pQueue.decrease(currDest, key)
 
-                    # O(1) * decrease() time and space
-                    pQueue.decrease(currDest, self.distances[currDest]) 
+                    distances[currDest] = newDist
+                    prevNodes[currDest] = currSrc
 
-    def getShortestPath( self, destIndex ):
+        return distances, prevNodes, numSettled
+
+    # O(|E|) time the first time, O(1) afterwards
+    # The largest factor by which straight-line distance can be scaled and still never
+    # exceed an edge's length. For the generated networks it's 100 (see Proj3GUI).
+    def _getHeuristicScale( self ):
+        if self.heuristicScale == None:
+            offsets, targets, weights = self.network.getCSR()
+            xs, ys = self.network.getCoords()
+            scale = float('inf')
+            for u in range(len(offsets) - 1):
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = targets[e]
+                    dist = math.hypot(xs[v] - xs[u], ys[v] - ys[u])
+                    if dist > 0: scale = min(scale, weights[e] / dist)
+            # shaved a little so rounding can't make the heuristic overestimate
+            self.heuristicScale = 0.0 if scale == float('inf') else scale * (1 - 1e-9)
+        return self.heuristicScale
+
+    # O(1) time
+    # The A* heuristic for destIndex: the straight-line distance left to it, scaled so it
+    # never overestimates. It's consistent, so no node is ever settled twice.
+    def _straightLineHeuristic( self, destIndex ):
+        xs, ys = self.network.getCoords()
+        destX, destY = xs[destIndex], ys[destIndex]
+        scale = self._getHeuristicScale()
+        return lambda node: scale * math.hypot(xs[node] - destX, ys[node] - destY)
+
+    # Bidirectional Dijkstra: a forward search from srcIndex and a backward search over
+    # the reversed edges from destIndex take turns settling one node each. best tracks
+    # the shortest src -> node -> dest path seen so far, and it is optimal once some
+    # node has been settled by both searches.
+    def _bidirectional( self, srcIndex, destIndex, queue ):
+        graphs = (self.network.getCSR(), self.network.getReverseCSR())
+        numNodes = len(graphs[0][0]) - 1
+
+        pQueues = (self._makeQueue(queue, numNodes), self._makeQueue(queue, numNodes))
+        distances = ([float('inf')] * numNodes, [float('inf')] * numNodes)
+        prevNodes = ([None] * numNodes, [None] * numNodes)
+        settled = (bytearray(numNodes), bytearray(numNodes))
+
+        for side, start in ((0, srcIndex), (1, destIndex)):
+            distances[side][start] = 0
+            pQueues[side].insert(start, 0)
+
+        best = 0 if srcIndex == destIndex else float('inf')
+        meetNode = srcIndex if srcIndex == destIndex else None
+        numSettled = 0
+        side = 0
+
+        while pQueues[0].size != 0 and pQueues[1].size != 0:
+            currSrc = pQueues[side].deleteMin()
+            numSettled += 1
+            settled[side][currSrc] = 1
+            if settled[1 - side][currSrc]: break
 
+            offsets, targets, weights = graphs[side]
+            dists, otherDists = distances[side], distances[1 - side]
+            currDist = dists[currSrc]
+            for edgeIndex in range(offsets[currSrc], offsets[currSrc + 1]):
+                currDest = targets[edgeIndex]
+                newDist = currDist + weights[edgeIndex]
+                if newDist < dists[currDest]:
+                    if dists[currDest] == float('inf'): pQueues[side].insert(currDest, newDist)
+                    else: pQueues[side].decrease(currDest, newDist)
+
+                    dists[currDest] = newDist
+                    prevNodes[side][currDest] = currSrc
+
+                    if newDist + otherDists[currDest] < best:
+                        best = newDist + otherDists[currDest]
+                        meetNode = currDest
+
+            side = 1 - side
+
+        # Hand back the forward search, with the backward half of the path spliced on so
+        # getShortestPath(destIndex) works. The distances are summed from the source with
+        # the real edge lengths, the same way Dijkstra would have computed them.
+        fwdDists, fwdPrev = distances[0], prevNodes[0]
+        if meetNode != None:
+            currNode = meetNode
+            while currNode != destIndex:
+                nextNode = prevNodes[1][currNode]
+                fwdDists[nextNode] = fwdDists[currNode] + self._edgeLength(currNode, nextNode)
+                fwdPrev[nextNode] = currNode
+                currNode = nextNode
+
+        self.distances, self.prevNodes, self.numSettled = fwdDists, fwdPrev, numSettled
+
+    # Preprocesses the network for method='ch' queries and returns how long that took.
+    # Doing it up front keeps the preprocessing out of the first query's time. The
+    # hierarchy keeps a core of uncontracted nodes, as many as coreDegree leaves (see
+    # ContractionHierarchy.py); hierarchy.coreSize says how many that came to.
+    def buildContractionHierarchy( self, coreDegree=CORE_DEGREE ):
+        self.hierarchy = ContractionHierarchy(self.network, coreDegree=coreDegree)
+        return self.hierarchy.preprocessTime
+
+    # Contraction Hierarchies query, see ContractionHierarchy.py. Like _bidirectional it
+    # only fills in distances/prevNodes along the path it finds.
+    def _contractionQuery( self, srcIndex, destIndex ):
+        if self.hierarchy == None: self.buildContractionHierarchy()
+        length, path, numSettled = self.hierarchy.query(srcIndex, destIndex)
+
+        numNodes = len(self.network.getCSR()[0]) - 1
+        distances = [float('inf')] * numNodes
+        prevNodes = [None] * numNodes
+        distances[srcIndex] = 0
+        for i in range(1, len(path)):
+            distances[path[i]] = distances[path[i - 1]] + self._edgeLength(path[i - 1], path[i])
+            prevNodes[path[i]] = path[i - 1]
+
+        self.distances, self.prevNodes, self.numSettled = distances, prevNodes, numSettled
+
+    # Changes the length of the edge(s) from u to v to weight. If the last search was
+    # computeShortestPaths (or was answered from the cache), distances/prevNodes are then
+    # brought up to date by only revisiting the nodes whose shortest paths change, the
+    # way Ramalingam and Reps do it, rather than running Dijkstra again. Cached trees,
+    # the A* heuristic scale, the shortest edge length and the contraction hierarchy are
+    # all thrown away.
+    # Returns the time taken; numSettled is the number of nodes revisited.
+    def updateEdge( self, u, v, weight ):
+        t1 = time.time()
+
+        oldWeight = self._edgeLength(u, v)
+        self.network.setEdgeWeight(u, v, weight)
+        self.heuristicScale = None
+        self.minEdgeLength = None
+        self.hierarchy = None
+        self.cache.clear()
+
+        self.numSettled = 0
+        if self.completeTree:
+            if weight < oldWeight: self._edgeDecreased(u, v, weight)
+            elif weight > oldWeight: self._edgeIncreased(u, v)
+
+        t2 = time.time()
+        return (t2-t1)
+
+    # O(k log k) time for the k nodes that get closer
+    # A shorter edge can only pull v, and whatever is reached through v, closer to the
+    # source, so Dijkstra picks up from v and stops wherever nothing improves.
+    def _edgeDecreased( self, u, v, weight ):
+        offsets, targets, weights = self.network.getCSR()
+        distances, prevNodes = self.distances, self.prevNodes
+
+        newDist = distances[u] + weight
+        if not newDist < distances[v]: return
+        distances[v] = newDist
+        prevNodes[v] = u
+
+        pQueue = [(newDist, v)]
+        while pQueue:
+            currDist, currSrc = heappop(pQueue)
+            if currDist > distances[currSrc]: continue # stale entry
+            self.numSettled += 1
+            for edgeIndex in range(offsets[currSrc], offsets[currSrc + 1]):
+                currDest = targets[edgeIndex]
+                newDist = currDist + weights[edgeIndex]
+                if newDist < distances[currDest]:
+                    distances[currDest] = newDist
+                    prevNodes[currDest] = currSrc
+                    heappush(pQueue, (newDist, currDest))
+
+    # O(k log k + edges in and out of them) time for the k nodes below v in the tree
+    # A longer edge only matters if it's in the shortest-path tree, and then only for the
+    # subtree under v. Everything outside the subtree keeps its distance, so each node in
+    # it starts from its best in-edge from outside, and Dijkstra restricted to the
+    # subtree settles the rest.
+    def _edgeIncreased( self, u, v ):
+        if self.prevNodes[v] != u: return
+
+        offsets, targets, weights = self.network.getCSR()
+        inOffsets, sources, inWeights = self.network.getReverseCSR()
+        distances, prevNodes = self.distances, self.prevNodes
+        noPrev = prevNodes[self.source] # None, or -1 in a tree that came from the cache
+
+        # the children of a node are the out-neighbors whose shortest path ends with it
+        affected = {v}
+        stack = [v]
+        while stack:
+            currSrc = stack.pop()
+            for edgeIndex in range(offsets[currSrc], offsets[currSrc + 1]):
+                currDest = targets[edgeIndex]
+                if prevNodes[currDest] == currSrc and not currDest in affected:
+                    affected.add(currDest)
+                    stack.append(currDest)
+
+        for node in affected:
+            distances[node] = float('inf')
+            prevNodes[node] = noPrev
+
+        pQueue = []
+        for node in affected:
+            for edgeIndex in range(inOffsets[node], inOffsets[node + 1]):
+                prevNode = sources[edgeIndex]
+                if prevNode in affected: continue
+                newDist = distances[prevNode] + inWeights[edgeIndex]
+                if newDist < distances[node]:
+                    distances[node] = newDist
+                    prevNodes[node] = prevNode
+            if distances[node] != float('inf'): heappush(pQueue, (distances[node], node))
+
+        while pQueue:
+            currDist, currSrc = heappop(pQueue)
+            if currDist > distances[currSrc]: continue # stale entry
+            self.numSettled += 1
+            for edgeIndex in range(offsets[currSrc], offsets[currSrc + 1]):
+                currDest = targets[edgeIndex]
+                if not currDest in affected: continue
+                newDist = currDist + weights[edgeIndex]
+                if newDist < distances[currDest]:
+                    distances[currDest] = newDist
+                    prevNodes[currDest] = currSrc
+                    heappush(pQueue, (newDist, currDest))
+
+    # Yen's algorithm: the k shortest simple (loop-free) paths from srcIndex to destIndex,
+    # shortest first, as a list of (cost, node ids as an array('q')). Fewer come back if
+    # there aren't k of them, or if timeLimit seconds run out first, in which case the
+    # paths found so far are returned (the clock is checked between spur searches). Costs
+    # are summed along each path from srcIndex, so the first one comes out exactly as
+    # getShortestPath's does. numSettled adds up the nodes settled by every search.
+    #
+    # Each new path comes from a "spur": keep the first i + 1 nodes of an earlier path (the
+    # root), and find the shortest way from its last node to destIndex that doesn't go back
+    # through the root or leave along an edge an earlier path with the same root took.
+    # Most spurs don't need a search of their own. One Dijkstra backwards from destIndex
+    # gives every node's distance to it and the next node on the way, and if the best
+    # allowed first edge leads onto a way that misses the root, that way is the spur.
+    # Otherwise an A* search from the spur node runs, with those distances as its heuristic.
+    # They also bound what a spur can cost, so spurs that can't make it into the k shortest
+    # are skipped, and, following Lawler, a path only gets spurs from where it left the
+    # path it was spurred from, since the spurs before that were already tried.
+    # queue is the queue for the first search, the one _dijkstra runs, which stops at
+    # destIndex.
+    def kShortestPaths( self, srcIndex, destIndex, k, queue='heap', timeLimit=None ):
+        t1 = time.time()
+        self.numSettled = 0
+        self.queueStats = None
+        if k <= 0: return []
+
+        distances, prevNodes, self.numSettled = self._search(srcIndex, queue, destIndex)
+        if distances[destIndex] == float('inf'): return []
+        path = [destIndex]
+        while path[-1] != srcIndex: path.append(prevNodes[path[-1]])
+        path.reverse()
+        paths = [(self._pathCost(path), path)]
+        if k == 1: return self._kPathsResult(paths)
+
+        offsets, targets, weights = self.network.getCSR()
+        toDest, nextNodes, numSettled = self._searchTo(destIndex)
+        self.numSettled += numSettled
+        deviations = [0] # where each path left the one it was spurred from
+        candidates = [] # heap of (cost, path, deviation)
+        seen = {tuple(path)}
+
+        while len(paths) < k:
+            lastPath = paths[-1][1]
+            rootCost = 0
+            for i in range(len(lastPath) - 1):
+                spurNode = lastPath[i]
+                if i > 0: rootCost += self._edgeLength(lastPath[i - 1], spurNode)
+                if i < deviations[-1]: continue
+                if timeLimit != None and time.time() - t1 > timeLimit: return self._kPathsResult(paths)
+
+                root = lastPath[:i + 1]
+                rootNodes = set(root)
+                takenNext = {p[i + 1] for _, p in paths if len(p) > i + 1 and p[:i + 1] == root}
+                allowed = [e for e in range(offsets[spurNode], offsets[spurNode + 1])
+                           if not targets[e] in takenNext and not targets[e] in rootNodes]
+                if not allowed: continue
+                bestEdge = min(allowed, key=lambda e: weights[e] + toDest[targets[e]])
+                bound = rootCost + weights[bestEdge] + toDest[targets[bestEdge]]
+                # no spur from here can beat the candidates that are already enough for k
+                numNeeded = k - len(paths)
+                if bound == float('inf') or (len(candidates) >= numNeeded and
+                                             bound > nsmallest(numNeeded, candidates)[-1][0]):
+                    continue
+
+                spurPath = [spurNode, targets[bestEdge]]
+                while spurPath[-1] != destIndex and not nextNodes[spurPath[-1]] in rootNodes:
+                    spurPath.append(nextNodes[spurPath[-1]])
+                if spurPath[-1] != destIndex:
+                    spurPath = self._spurSearch(spurNode, destIndex, root, takenNext, toDest)
+                    if spurPath == None: continue
+
+                path = root[:-1] + spurPath
+                if not tuple(path) in seen:
+                    seen.add(tuple(path))
+                    heappush(candidates, (self._pathCost(path), path, i))
+
+            if not candidates: break
+            cost, path, deviation = heappop(candidates)
+            paths.append((cost, path))
+            deviations.append(deviation)
+
+        return self._kPathsResult(paths)
+
+    # A* from spurNode to destIndex around the root, not starting with an edge to any of
+    # takenNext. Returns the path or None. The distances to destIndex in the whole graph
+    # can only underestimate the ones around the root, so, shaved a little against
+    # rounding, they make the heuristic; entries are never decreased in place, so a node
+    # reached again more cheaply just goes back in the queue.
+    def _spurSearch( self, spurNode, destIndex, root, takenNext, toDest ):
+        offsets, targets, weights = self.network.getCSR()
+        shave = 1 - 1e-9
+        rootNodes = set(root)
+        distances = {spurNode: 0}
+        prevNodes = {spurNode: None}
+        pQueue = [(shave * toDest[spurNode], 0, spurNode)]
+
+        while pQueue:
+            _, currDist, currSrc = heappop(pQueue)
+            if currDist > distances[currSrc]: continue # stale entry
+            self.numSettled += 1
+            if currSrc == destIndex: break
+            for edgeIndex in range(offsets[currSrc], offsets[currSrc + 1]):
+                currDest = targets[edgeIndex]
+                if currDest in rootNodes or (currSrc == spurNode and currDest in takenNext): continue
+                newDist = currDist + weights[edgeIndex]
+                if newDist < distances.get(currDest, float('inf')) and toDest[currDest] != float('inf'):
+                    distances[currDest] = newDist
+                    prevNodes[currDest] = currSrc
+                    heappush(pQueue, (newDist + shave * toDest[currDest], newDist, currDest))
+
+        if not destIndex in distances: return None
+        spurPath = [destIndex]
+        while spurPath[-1] != spurNode: spurPath.append(prevNodes[spurPath[-1]])
+        spurPath.reverse()
+        return spurPath
+
+    # O(|E| log |V|) time
+    # Dijkstra over the reversed edges: returns (distance from each node to destIndex, the
+    # next node on the way there, number of settled nodes)
+    def _searchTo( self, destIndex ):
+        inOffsets, sources, inWeights = self.network.getReverseCSR()
+        numNodes = len(inOffsets) - 1
+        distances = [float('inf')] * numNodes
+        distances[destIndex] = 0
+        nextNodes = [None] * numNodes
+        pQueue = [(0, destIndex)]
+        numSettled = 0
+        while pQueue:
+            currDist, currDest = heappop(pQueue)
+            if currDist > distances[currDest]: continue # stale entry
+            numSettled += 1
+            for edgeIndex in range(inOffsets[currDest], inOffsets[currDest + 1]):
+                currSrc = sources[edgeIndex]
+                newDist = currDist + inWeights[edgeIndex]
+                if newDist < distances[currSrc]:
+                    distances[currSrc] = newDist
+                    nextNodes[currSrc] = currDest
+                    heappush(pQueue, (newDist, currSrc))
+        return distances, nextNodes, numSettled
+
+    def _kPathsResult( self, paths ):
+        return [(cost, array('q', path)) for cost, path in paths]
+
+    # O(path length * out-degree) time
+    # summed from the first node on, the same order Dijkstra adds the lengths up in
+    def _pathCost( self, path ):
+        cost = 0
+        for i in range(len(path) - 1): cost += self._edgeLength(path[i], path[i + 1])
+        return cost
+
+    # O(out-degree) time
+    # length of the shortest edge from u to v, inf if there is none
+    def _edgeLength( self, u, v ):
+        offsets, targets, weights = self.network.getCSR()
+        return min((weights[e] for e in range(offsets[u], offsets[u + 1]) if targets[e] == v),
+                   default=float('inf'))
+
+    # O(path length) time
+    # Returns (cost, node ids from the source to destIndex) without building any lists.
+    # The ids are a memoryview into a buffer that the next call overwrites, so copy them
+    # (e.g. with array('q', ids)) to keep them around.
+    def getPathNodes( self, destIndex ):
         totalLength = self.distances[destIndex]
+        if totalLength == float('inf'): return totalLength, memoryview(self.pathBuffer)[:0]
+
+        # filled in from the back, so the path comes out source first
+        pathBuffer = self.pathBuffer
+        i = len(pathBuffer)
+        currNode = destIndex
+        while currNode != self.source:
+            i -= 1
+            pathBuffer[i] = currNode
+            currNode = self.prevNodes[currNode]
+        i -= 1
+        pathBuffer[i] = self.source
+
+        return totalLength, memoryview(pathBuffer)[i:]
+
+    # Same as getPathNodes, but 'path' gives the (loc, loc, label) tuples the GUI draws.
+    # They're only made when the path is iterated over, see ShortestPathEdges.
+    def getShortestPath( self, destIndex ):
+        totalLength, pathNodes = self.getPathNodes(destIndex)
 
         if totalLength == float('inf'): return {'cost':float('inf'), 'path':[]}
 
-        # get the indices for the path
-        pathIndices = []
-        currPrevIndex = destIndex
-        while currPrevIndex != self.source:
-            pathIndices.append(currPrevIndex)
-            currPrevIndex = self.prevNodes[currPrevIndex]
-        pathIndices.append(self.source)
-        # pathIndices now starts with the final destination and ends with the source
-
-        # calculate distances
-        edgeDists = []
-        lengthLeft = totalLength
-        for i in range(len(pathIndices) - 1):
-            subLength = self.distances[pathIndices[i + 1]]
-            edgeDists.append(lengthLeft - subLength)
-            lengthLeft = subLength
-        # edgeDists starts at the back and goes in reverse order like pathIndices
-
-        # construct path (in reverse)
-        pathEdges = []
-        for i in range(len(edgeDists)):
-            pathEdges.append( (self.network.nodes[pathIndices[i]].loc,
-                               self.network.nodes[pathIndices[i + 1]].loc,
-                               '{:.0f}'.format(edgeDists[i])) )
-        
-        pathEdges = reversed(pathEdges)
+        return {'cost':totalLength, 'path':ShortestPathEdges(self.network, array('q', pathNodes))}
+
+
+# The edges along a path as (loc, loc, length label) tuples, made one at a time on
+# demand. Edges come source first, but each tuple has the end nearer the destination
+# first, as getShortestPath always returned them. The labels are the lengths of the
+# graph's edges, not differences between distances, so they don't pick up rounding
+# from the sums.
+class ShortestPathEdges:
+    __slots__ = ('network', 'pathNodes')
+
+    def __init__( self, network, pathNodes ):
+        self.network = network
+        self.pathNodes = pathNodes # node ids, source first
+
+    def __len__( self ):
+        return max(len(self.pathNodes) - 1, 0)
+
+    def __getitem__( self, i ):
+        if i < 0: i += len(self)
+        if not 0 <= i < len(self): raise IndexError('edge index out of range')
+        allNodes = self.network.getNodes()
+        src, dest = self.pathNodes[i], self.pathNodes[i + 1]
+        return (allNodes[dest].loc, allNodes[src].loc, self._label(src, dest))
+
+    def __iter__( self ):
+        if len(self) == 0: return
+        allNodes = self.network.getNodes()
+        srcLoc = allNodes[self.pathNodes[0]].loc
+        for i in range(len(self)):
+            src, dest = self.pathNodes[i], self.pathNodes[i + 1]
+            destLoc = allNodes[dest].loc # each loc gets looked up once, not once per edge
+            yield (destLoc, srcLoc, self._label(src, dest))
+            srcLoc = destLoc
 
-        return {'cost':totalLength, 'path':pathEdges}
\ No newline at end of file
+    def _label( self, src, dest ):
+        offsets, targets, weights = self.network.getCSR()
+        length = float('inf')
+        for e in range(offsets[src], offsets[src + 1]):
+            if targets[e] == dest and weights[e] < length: length = weights[e]
+        return '{:.0f}'.format(length)
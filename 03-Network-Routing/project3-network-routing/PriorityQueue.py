@@ -1,4 +1,13 @@
+from array import array
 from collections import namedtuple
+from heapq import heappush, heappop
+from time import perf_counter
+
+# NumPy is optional: ArrayQueue uses it for a vectorized deleteMin() when it's installed
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # We shall assume that memory allocation requires O(1) time. Also all methods and
 # operations for this class require O(n) space complexity total, n being the
@@ -143,43 +152,435 @@ class HeapQueue:
 # number of items.
 class ArrayQueue:
     def __init__( self, maxNumNodes ):
-        # nodes are named numerically upon insertion
-        self.vals = [None] * maxNumNodes
+        # nodes are named numerically upon insertion; anything not in the queue holds
+        # +inf, so the minimum can be found without skipping over empty slots
+        if np != None: self.vals = np.full(maxNumNodes, np.inf) # float64
+        else: self.vals = [float('inf')] * maxNumNodes
+        # which nodes are in the queue, since a queued node can have the value +inf too
+        self.queued = bytearray(maxNumNodes)
         self.size = 0
 
     # O(1) time, O(1) space
     def insert( self, index, val ):
         # this only takes O(1) time if vals[] is already initialized to size
         self.vals[index] = val
+        self.queued[index] = 1
         self.size += 1
     
     # O(n) time, O(1) space
     def deleteMin( self ):
         # accesses _findMin(), which takes O(n) time
         minIndex = self._findMin()
-        self.vals[minIndex] = None
+        self.vals[minIndex] = float('inf')
+        self.queued[minIndex] = 0
         self.size -= 1
         return minIndex
     
     # O(n) time, O(1) space
     def _findMin( self ):
-        currMinIndex = 0
-        for i in range(len(self.vals)): # loops n times
-            if self.vals[currMinIndex] == None:
-                currMinIndex = i + 1
-                continue
+        # one pass over every slot, done by NumPy's argmin or by min() in C
+        if np != None: minIndex = int(self.vals.argmin())
+        else: minIndex = min(range(len(self.vals)), key=self.vals.__getitem__)
 
-            if self.vals[i] == None: continue
-            
-            if self.vals[i] < self.vals[currMinIndex]: currMinIndex = i
+        # the minimum is +inf, so every node left is unreachable and any of them will do
+        if not self.queued[minIndex]: minIndex = self.queued.index(1)
 
-        return currMinIndex
+        return minIndex
         
     # O(1) time, O(1) space
     def decrease( self, nodeID, newVal ):
         # returns true if the value was updated, false otherwise
-        if newVal < self.vals[nodeID]:
+        if self.queued[nodeID] and newVal < self.vals[nodeID]:
             self.vals[nodeID] = newVal
             return True
         
-        return False
\ No newline at end of file
+        return False
+
+
+# Binary heap built on heapq that never moves an item once it is pushed. decrease()
+# just pushes a second copy with the smaller value, and deleteMin() throws away copies
+# whose value is no longer current. There is no tracker to update and no namedtuple
+# per operation, at the price of up to O(|E|) entries in the heap.
+class LazyHeapQueue:
+    def __init__( self, maxNumNodes ):
+        self.heap = []
+        # current value of every queued id, None if it isn't in the queue
+        self.vals = [None] * maxNumNodes # O(1) time, O(n) space
+        self.size = 0
+
+    # O(logn) time, O(1) space
+    def insert( self, id, val ):
+        self.vals[id] = val
+        self.size += 1
+        heappush(self.heap, (val, id))
+
+    # O(logn) amortized time, O(1) space
+    def deleteMin( self ):
+        vals = self.vals
+        while True:
+            val, id = heappop(self.heap)
+            if vals[id] == val: # otherwise it's a stale copy left behind by decrease()
+                vals[id] = None
+                self.size -= 1
+                return id
+
+    # O(logn) time, O(1) space
+    def decrease( self, nodeID, newVal ):
+        currVal = self.vals[nodeID]
+        if currVal != None and newVal < currVal:
+            self.vals[nodeID] = newVal
+            heappush(self.heap, (newVal, nodeID))
+            return True
+
+        return False
+
+
+# Indexed d-ary heap. A wider heap is shallower, so insert() and decrease(), which only
+# float up, get cheaper while deleteMin() compares up to d children per level. Items are
+# plain ids with their values kept in a separate list, and sifting moves a hole instead
+# of swapping, so every level costs one write per list.
+class DaryHeapQueue:
+    def __init__( self, maxNumNodes, d=4 ):
+        self.d = d
+        self.heap = [None] * maxNumNodes # O(1) time, O(n) space
+        # the value and heap position of every id, indexed by id
+        self.vals = [None] * maxNumNodes
+        self.positions = [None] * maxNumNodes
+        self.size = 0
+
+    # O(log_d n) time, O(1) space
+    def insert( self, id, val ):
+        self.vals[id] = val
+        self.heap[self.size] = id
+        self.size += 1
+        self._floatUp(self.size - 1)
+
+    # O(d log_d n) time, O(1) space
+    def deleteMin( self ):
+        firstID = self.heap[0]
+        self.size -= 1
+        if self.size > 0:
+            self.heap[0] = self.heap[self.size]
+            self._siftDown(0)
+        self.heap[self.size] = None
+        self.positions[firstID] = None
+        return firstID
+
+    # O(log_d n) time, O(1) space
+    def decrease( self, nodeID, newVal ):
+        heapIndex = self.positions[nodeID]
+        if heapIndex != None and newVal < self.vals[nodeID]:
+            self.vals[nodeID] = newVal
+            self._floatUp(heapIndex)
+            return True
+
+        return False
+
+    # O(log_d n) time, O(1) space
+    def _floatUp( self, currNodePos ):
+        heap, vals, positions, d = self.heap, self.vals, self.positions, self.d
+        currID = heap[currNodePos]
+        currVal = vals[currID]
+        while currNodePos > 0:
+            parentPos = (currNodePos - 1) // d
+            parentID = heap[parentPos]
+            if currVal < vals[parentID]:
+                heap[currNodePos] = parentID
+                positions[parentID] = currNodePos
+                currNodePos = parentPos
+            else: break
+        heap[currNodePos] = currID
+        positions[currID] = currNodePos
+
+    # O(d log_d n) time, O(1) space
+    def _siftDown( self, currNodePos ):
+        heap, vals, positions, d, size = self.heap, self.vals, self.positions, self.d, self.size
+        currID = heap[currNodePos]
+        currVal = vals[currID]
+        while True:
+            firstChildPos = d * currNodePos + 1
+            if firstChildPos >= size: break
+
+            # find the smallest of the (up to) d children
+            minChildPos = firstChildPos
+            minChildVal = vals[heap[firstChildPos]]
+            for childPos in range(firstChildPos + 1, min(firstChildPos + d, size)):
+                childVal = vals[heap[childPos]]
+                if childVal < minChildVal:
+                    minChildPos = childPos
+                    minChildVal = childVal
+
+            if minChildVal < currVal:
+                heap[currNodePos] = heap[minChildPos]
+                positions[heap[currNodePos]] = currNodePos
+                currNodePos = minChildPos
+            else: break
+        heap[currNodePos] = currID
+        positions[currID] = currNodePos
+
+
+# O(1) time
+# Takes id out of a bucket list of the radix heap or Dial's queue, positions[id] being
+# where it sits: the last id in the bucket takes the removed one's place
+def _removeFromBucket( ids, positions, id ):
+    lastID = ids.pop()
+    if lastID != id:
+        ids[positions[id]] = lastID
+        positions[lastID] = positions[id]
+
+
+# Radix heap. It needs monotone values: nothing inserted may be smaller than the last
+# value deleteMin() returned, which holds for Dijkstra and for A* with a consistent
+# heuristic. Values are non-negative floats, and those sort the same way as their IEEE 754
+# bit patterns, so the bit patterns serve as 64 bit integer keys without rounding
+# anything. Bucket i > 0 holds the keys whose highest bit that differs from the last
+# deleted key is bit i - 1, bucket 0 the keys equal to it. Only the lowest non-empty
+# bucket is ever split up, and a key can only move down 64 times.
+class RadixHeapQueue:
+    def __init__( self, maxNumNodes ):
+        self.buckets = [[] for _ in range(65)]
+        # the key of every queued id, and where it sits: which bucket, at which position
+        self.keys = [None] * maxNumNodes # O(1) time, O(n) space
+        self.bucketOf = [None] * maxNumNodes
+        self.positions = [None] * maxNumNodes
+        self.lastKey = 0
+        self.size = 0
+        # a float written into floatBuffer reads back from keyBuffer as its bit pattern
+        self.floatBuffer = array('d', [0.0])
+        self.keyBuffer = memoryview(self.floatBuffer).cast('B').cast('Q')
+
+    # O(1) time, O(1) space
+    def insert( self, id, val ):
+        self.floatBuffer[0] = val
+        self.keys[id] = self.keyBuffer[0]
+        self._place(id)
+        self.size += 1
+
+    # O(1) amortized time (O(64) per key over its lifetime), O(1) space
+    def deleteMin( self ):
+        buckets = self.buckets
+        if not buckets[0]:
+            bucket = 1
+            while not buckets[bucket]: bucket += 1
+            # the smallest key here becomes lastKey, which sends every key in the bucket
+            # to a lower one
+            ids = buckets[bucket]
+            buckets[bucket] = []
+            self.lastKey = min(self.keys[id] for id in ids)
+            for id in ids: self._place(id)
+
+        id = buckets[0].pop()
+        self.keys[id] = None
+        self.size -= 1
+        return id
+
+    # O(1) time, O(1) space
+    def decrease( self, nodeID, newVal ):
+        self.floatBuffer[0] = newVal
+        newKey = self.keyBuffer[0]
+        currKey = self.keys[nodeID]
+        if currKey != None and newKey < currKey:
+            self._remove(nodeID)
+            self.keys[nodeID] = newKey
+            self._place(nodeID)
+            return True
+
+        return False
+
+    # O(1) time
+    def _place( self, id ):
+        key = self.keys[id]
+        # A key below lastKey breaks the monotone rule (rounding in A* could do it by a
+        # hair). It's the smallest key there is, so bucket 0 is still right for it.
+        bucket = (key ^ self.lastKey).bit_length() if key > self.lastKey else 0
+        self.bucketOf[id] = bucket
+        self.positions[id] = len(self.buckets[bucket])
+        self.buckets[bucket].append(id)
+
+    # O(1) time
+    def _remove( self, id ):
+        _removeFromBucket(self.buckets[self.bucketOf[id]], self.positions, id)
+
+
+# Dial's bucket queue. Values are grouped into buckets of the given width, which are
+# visited in order; deleteMin() returns the smallest value in the current bucket, so the
+# order is exactly a heap's whatever the width. With the width near the shortest edge
+# length a bucket only holds a few nodes at a time. Like the radix heap it expects
+# monotone values: the current bucket only moves forward, and stepping over empty
+# buckets costs O(largest value / width) over a whole search.
+class DialQueue:
+    def __init__( self, maxNumNodes, width=1.0 ):
+        self.width = width
+        self.buckets = {} # bucket number -> list of ids, for non-empty buckets only
+        self.vals = [None] * maxNumNodes # O(1) time, O(n) space
+        self.bucketOf = [None] * maxNumNodes
+        self.positions = [None] * maxNumNodes
+        self.currBucket = 0
+        self.size = 0
+
+    # O(1) time, O(1) space
+    def insert( self, id, val ):
+        self.vals[id] = val
+        self._place(id)
+        self.size += 1
+
+    # O(bucket size) time, O(1) space, plus stepping to the next non-empty bucket
+    def deleteMin( self ):
+        buckets = self.buckets
+        while not self.currBucket in buckets: self.currBucket += 1
+
+        ids = buckets[self.currBucket]
+        vals = self.vals
+        minID = ids[0]
+        for id in ids:
+            if vals[id] < vals[minID]: minID = id
+
+        self._remove(minID)
+        vals[minID] = None
+        self.size -= 1
+        return minID
+
+    # O(1) time, O(1) space
+    def decrease( self, nodeID, newVal ):
+        currVal = self.vals[nodeID]
+        if currVal != None and newVal < currVal:
+            self._remove(nodeID)
+            self.vals[nodeID] = newVal
+            self._place(nodeID)
+            return True
+
+        return False
+
+    # O(1) time
+    def _place( self, id ):
+        bucket = int(self.vals[id] / self.width)
+        if bucket < self.currBucket: self.currBucket = bucket # only if values aren't monotone
+        ids = self.buckets.get(bucket)
+        if ids == None: ids = self.buckets[bucket] = []
+        self.bucketOf[id] = bucket
+        self.positions[id] = len(ids)
+        ids.append(id)
+
+    # O(1) time
+    def _remove( self, id ):
+        bucket = self.bucketOf[id]
+        ids = self.buckets[bucket]
+        _removeFromBucket(ids, self.positions, id)
+        if not ids: del self.buckets[bucket]
+
+
+# The queue implementations NetworkRoutingSolver can be told to use, by name
+QUEUE_TYPES = {
+    'array': ArrayQueue,
+    'heap': HeapQueue,
+    'lazy': LazyHeapQueue,
+    'dary': DaryHeapQueue,
+    'radix': RadixHeapQueue,
+    'dial': DialQueue,
+}
+
+
+# Instrumentation. A queue built through instrumentedQueue(queueType) counts and times
+# every operation into a QueueStats; the classes above are left as they are, so a queue
+# that isn't instrumented pays nothing for it.
+QUEUE_OPERATIONS = ('insert', 'deleteMin', 'decrease')
+# internal methods whose calls get counted too, for the classes that have them
+QUEUE_HOOKS = ('_swap', '_floatUp', '_siftDown', '_findMin', '_place', '_remove')
+
+class QueueStats:
+    def __init__( self ):
+        # calls to each of QUEUE_OPERATIONS and of the QUEUE_HOOKS the queue has
+        self.calls = dict.fromkeys(QUEUE_OPERATIONS + QUEUE_HOOKS, 0)
+        # seconds spent in each of QUEUE_OPERATIONS, timing overhead included
+        self.seconds = dict.fromkeys(QUEUE_OPERATIONS, 0.0)
+        # heap levels items moved up or down in total (the heaps only)
+        self.siftLevels = 0
+
+    def totalCalls( self ):
+        return sum(self.calls[op] for op in QUEUE_OPERATIONS)
+
+    def totalSeconds( self ):
+        return sum(self.seconds.values())
+
+    def asDict( self ):
+        return {'calls': dict(self.calls), 'seconds': dict(self.seconds), 'siftLevels': self.siftLevels}
+
+    def __str__( self ):
+        ops = ' '.join('{}={}/{:.3f}ms'.format(op, self.calls[op], 1000 * self.seconds[op]) for op in QUEUE_OPERATIONS)
+        return '{} siftLevels={}'.format(ops, self.siftLevels)
+
+# depth of heap position pos in a d-ary heap
+def _heapDepth( pos, d ):
+    depth = 0
+    while pos > 0:
+        pos = (pos - 1) // d
+        depth += 1
+    return depth
+
+_instrumentedTypes = {}
+
+# Returns a subclass of queueType that records into self.stats, a QueueStats shared by
+# every queue it's handed to (a new one if it's left out), built once per queueType
+def instrumentedQueue( queueType ):
+    if queueType in _instrumentedTypes: return _instrumentedTypes[queueType]
+
+    def timed( op ):
+        base = getattr(queueType, op)
+        def method( self, *args ):
+            t1 = perf_counter()
+            result = base(self, *args)
+            self.stats.seconds[op] += perf_counter() - t1
+            self.stats.calls[op] += 1
+            return result
+        return method
+
+    def counted( hook ):
+        base = getattr(queueType, hook)
+        def method( self, *args ):
+            self.stats.calls[hook] += 1
+            return base(self, *args)
+        return method
+
+    members = {op: timed(op) for op in QUEUE_OPERATIONS}
+    members.update({hook: counted(hook) for hook in QUEUE_HOOKS if hasattr(queueType, hook)})
+
+    # HeapQueue moves an item one level per _swap
+    if hasattr(queueType, '_swap'):
+        baseSwap = queueType._swap
+        def swap( self, index1, index2 ):
+            self.stats.calls['_swap'] += 1
+            self.stats.siftLevels += 1
+            baseSwap(self, index1, index2)
+        members['_swap'] = swap
+
+    # DaryHeapQueue moves a hole instead, so the levels come from where the item ends up
+    elif issubclass(queueType, DaryHeapQueue):
+        baseFloatUp, baseSiftDown = queueType._floatUp, queueType._siftDown
+        def floatUp( self, currNodePos ):
+            self.stats.calls['_floatUp'] += 1
+            id = self.heap[currNodePos]
+            baseFloatUp(self, currNodePos)
+            self.stats.siftLevels += _heapDepth(currNodePos, self.d) - _heapDepth(self.positions[id], self.d)
+        def siftDown( self, currNodePos ):
+            self.stats.calls['_siftDown'] += 1
+            id = self.heap[currNodePos]
+            baseSiftDown(self, currNodePos)
+            self.stats.siftLevels += _heapDepth(self.positions[id], self.d) - _heapDepth(currNodePos, self.d)
+        members['_floatUp'] = floatUp
+        members['_siftDown'] = siftDown
+
+    baseInit = queueType.__init__
+    def init( self, *args, stats=None, **kwargs ):
+        baseInit(self, *args, **kwargs)
+        self.stats = QueueStats() if stats == None else stats
+    members['__init__'] = init
+
+    _instrumentedTypes[queueType] = type('Instrumented' + queueType.__name__, (queueType,), members)
+    return _instrumentedTypes[queueType]
+
+# Makes an existing queue record into stats from now on, by switching it over to its
+# instrumented class
+def instrumentQueue( queue, stats ):
+    if not type(queue) in _instrumentedTypes.values(): queue.__class__ = instrumentedQueue(type(queue))
+    queue.stats = stats
+    return queue
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 import math
-import random
 import signal
 import sys
 import time
@@ -30,6 +29,7 @@ else:
 
 # Import in the code with the actual implementation
 from CS312Graph import *
+from NetworkGenerator import *
 from NetworkRoutingSolver import *
 # from NetworkRoutingSolver_faster import *
 # from NetworkRoutingSolver_complete import *
@@ -186,41 +186,14 @@ class Proj3GUI(QMainWindow):
     def newPoints(self):
         # TODO - ERROR CHECKING!!!!
         seed = int(self.randSeed.text())
-        random.seed(seed)
-        ptlist = []
-        RANGE = self.data_range
-        xr = self.data_range['x']
-        yr = self.data_range['y']
         npoints = int(self.size.text())
-        while len(ptlist) < npoints:
-            x = random.uniform(0.0, 1.0)
-            y = random.uniform(0.0, 1.0)
-            if True:
-                xval = xr[0] + (xr[1]-xr[0])*x
-                yval = yr[0] + (yr[1]-yr[0])*y
-                ptlist.append(QPointF(xval, yval))
-        return ptlist
+        return newPoints(npoints, seed, self.data_range, QPointF)
 
     def generateNetwork(self):
         nodes = self.newPoints()
-        OUT_DEGREE = 3
-        size = len(nodes)
-        edgeList = {}
-        for u in range(size):
-            edgeList[u] = []
-            pt_u = nodes[u]
-            chosen = []
-            for i in range(OUT_DEGREE):
-                v = random.randint(0, size-1)
-                while v in chosen or v == u:
-                    v = random.randint(0, size-1)
-                chosen.append(v)
-                pt_v = nodes[v]
-                uv_len = math.sqrt((pt_v.x()-pt_u.x())**2 +
-                                   (pt_v.y()-pt_u.y())**2)
-                edgeList[u].append((v, 100.0*uv_len))
-            edgeList[u] = sorted(edgeList[u], key=lambda n: n[0])
-        self.graph = CS312Graph(nodes, edgeList)
+        edgeList = randomEdges(nodes, OUT_DEGREE)
+        self.graph = CS312CompactGraph(nodes, edgeList)
+        self.solver.initializeNetwork(self.graph) # so clicks can find nodes right away
         self.genParams = (self.randSeed.text(), self.size.text())
         self.view.clearEdges()
         self.view.clearPoints()
@@ -278,7 +251,6 @@ class Proj3GUI(QMainWindow):
         self.view.repaint()
 
     def computeClicked(self):
-        self.solver.initializeNetwork(self.graph)
         doArray = False
         doHeap = False
         if self.useUnsorted.isChecked():
@@ -293,14 +265,14 @@ class Proj3GUI(QMainWindow):
             doArray = True
             doHeap = True
         if doArray:
-            array_time = self.solver.computeShortestPaths(
-                int(self.sourceNode.text())-1, use_heap=False)
+            array_time = self.solver.shortestPath(
+                int(self.sourceNode.text())-1, int(self.targetNode.text())-1, use_heap=False)
             array_path = self.solver.getShortestPath(
                 int(self.targetNode.text())-1)
             dist = array_path['cost']
         if doHeap:
-            heap_time = self.solver.computeShortestPaths(
-                int(self.sourceNode.text())-1, use_heap=True)
+            heap_time = self.solver.shortestPath(
+                int(self.sourceNode.text())-1, int(self.targetNode.text())-1, use_heap=True)
             heap_path = self.solver.getShortestPath(
                 int(self.targetNode.text())-1)
             dist = heap_path['cost']
@@ -385,20 +357,13 @@ class Proj3GUI(QMainWindow):
         if not self.graphReady:
             pass
         else:
-            id = -1
-            dist = math.inf
-            for node in self.graph.nodes:
-                if math.sqrt(pow((abs(node.loc.x()-point.x())), 2) + pow((abs(node.loc.y()-point.y())), 2)) < dist:
-                    dist = math.sqrt(
-                        pow((abs(node.loc.x()-point.x())), 2) + pow((abs(node.loc.y()-point.y())), 2))
-                    id = node.node_id+1
-            if id != -1:
-                self.view.clearEdges()
-                if clickednode == 'start':
-                    self.sourceNode.setText(str(id))
-                elif clickednode == 'end':
-                    self.targetNode.setText(str(id))
-                self.checkPathInputs()
+            id = self.solver.nearestNode(point.x(), point.y())+1
+            self.view.clearEdges()
+            if clickednode == 'start':
+                self.sourceNode.setText(str(id))
+            elif clickednode == 'end':
+                self.targetNode.setText(str(id))
+            self.checkPathInputs()
 
     def initUI(self):
         self.setWindowTitle('Network Routing')
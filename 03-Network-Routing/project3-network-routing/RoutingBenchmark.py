@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+
+# Headless benchmarks for the network routing project. Graphs are generated exactly
+# like Proj3GUI.generateNetwork does (see NetworkGenerator.py), but without Qt.
+#
+# usage: python3 RoutingBenchmark.py memory [sizes...]
+#        python3 RoutingBenchmark.py queues
+#        python3 RoutingBenchmark.py queries [sizes...]
+#        python3 RoutingBenchmark.py ch [sizes...]
+#        python3 RoutingBenchmark.py kpaths [sizes...]
+#        python3 RoutingBenchmark.py batch [workers...]
+#        python3 RoutingBenchmark.py delta [workers...]
+#        python3 RoutingBenchmark.py updates [sizes...]
+#        python3 RoutingBenchmark.py files [sizes...]
+#        python3 RoutingBenchmark.py generate [sizes...]
+#        python3 RoutingBenchmark.py suite [results.json]
+
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from CS312Graph import *
+from NetworkGenerator import *
+from NetworkRoutingSolver import *
+
+
+MEMORY_SIZES = [100000, 300000, 1000000]
+
+# (nodes, out-degree) of the graphs every queue type gets timed on
+SPARSE_GRAPHS = [(1000, 3), (10000, 3), (100000, 3)]
+DENSE_GRAPHS = [(500, 125), (1000, 250), (2000, 500)]
+# ArrayQueue is O(|V|^2), so it's left out above this many nodes
+ARRAY_LIMIT = 20000
+NUM_SOURCES = 3
+
+QUERY_SIZES = [10000, 100000]
+NUM_QUERIES = 50
+
+CH_SIZES = [1000, 10000, 100000]
+
+KPATHS_SIZES = [10000, 100000]
+KPATHS_KS = [1, 10, 100]
+KPATHS_QUERIES = 5
+
+UPDATE_SIZES = [10000, 100000]
+NUM_UPDATES = 200
+
+# 3.4M nodes is about 10M edges
+FILE_SIZES = [100000, 1000000, 3400000]
+
+GENERATE_SIZES = [10000, 100000, 1000000, 10000000]
+# the pure Python generator gets slow, and leaves the NumPy one to go on alone past this
+REFERENCE_LIMIT = 1000000
+
+# (nodes, out-degree) of the graphs the suite sweeps, with every queue and search mode
+SUITE_GRAPHS = [(1000, 3), (10000, 3), (100000, 3), (2000, 30), (2000, 300)]
+SUITE_MODES = ('full', 'dijkstra', 'astar', 'bidirectional')
+SUITE_QUERIES = 3
+
+# nodes and sources in the distance matrix computeManySources gets timed on
+BATCH_SIZE = 10000
+BATCH_SOURCES = 200
+
+# graph sizes and sources delta-stepping gets timed on; 3.4M nodes is about 10M edges
+DELTA_SIZES = [100000, 1000000, 3400000]
+DELTA_SOURCES = 3
+
+# Copies of the graph, node and edge classes as they were before they got __slots__,
+# the baseline of the memory benchmark. They stand alone rather than subclassing the
+# classes in CS312Graph.py, so their instances have a __dict__ and nothing else.
+class DictGraphEdge:
+    def __init__( self, src_node, dest_node, edge_length ):
+        self.src   = src_node
+        self.dest  = dest_node
+        self.length= edge_length
+
+class DictGraphNode:
+    def __init__( self, node_id, node_loc ):
+        self.node_id   = node_id
+        self.loc       = node_loc
+        self.neighbors = [] # array of edges
+
+    def addEdge( self, neighborNode, weight ):
+        self.neighbors.append( DictGraphEdge(self,neighborNode,weight) )
+
+class DictGraph:
+    def __init__( self, nodeList, edgeList ):
+        self.nodes = []
+        for i in range(len(nodeList)):
+            self.nodes.append( DictGraphNode( i, nodeList[i] ) )
+
+        for i in range(len(nodeList)):
+            neighbors = edgeList[i]
+            for n in neighbors:
+                self.nodes[i].addEdge( self.nodes[n[0]], n[1] )
+
+
+# Returns (bytes allocated by the graph, seconds to build it). The two are measured in
+# separate runs because tracemalloc slows construction down considerably.
+def measureGraph( graphType, nodes, edgeList ):
+    gc.collect()
+    t1 = time.perf_counter()
+    graph = graphType(nodes, edgeList)
+    t2 = time.perf_counter()
+    del graph
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    graph = graphType(nodes, edgeList)
+    graphBytes = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del graph # only let go of once it's been measured
+    return graphBytes, t2 - t1
+
+def memoryBenchmark( sizes ):
+    graphTypes = [('dict', DictGraph), ('slots', CS312Graph), ('csr', CS312CompactGraph)]
+    print('{:>9} {:>6} {:>12} {:>12} {:>10}'.format('nodes', 'graph', 'MB', 'bytes/edge', 'build sec'))
+    for size in sizes:
+        nodes, edgeList = generateNetwork(size)
+        numEdges = sum(len(edgeList[u]) for u in edgeList)
+        for name, graphType in graphTypes:
+            graphBytes, seconds = measureGraph(graphType, nodes, edgeList)
+            print('{:>9} {:>6} {:>12.1f} {:>12.1f} {:>10.3f}'.format(
+                size, name, graphBytes / 2**20, graphBytes / numEdges, seconds))
+
+# Average seconds computeShortestPaths takes with the given queue over NUM_SOURCES sources
+def timeQueue( solver, queue, numNodes ):
+    random.seed(1)
+    sources = [random.randint(0, numNodes-1) for _ in range(NUM_SOURCES)]
+    return sum(solver.computeShortestPaths(src, queue=queue, useCache=False) for src in sources) / NUM_SOURCES
+
+def queueBenchmark():
+    queues = list(QUEUE_TYPES)
+    print('{:>7} {:>8} {:>8} '.format('kind', 'nodes', 'edges') + ' '.join('{:>9}'.format(q) for q in queues))
+    for kind, graphs in (('sparse', SPARSE_GRAPHS), ('dense', DENSE_GRAPHS)):
+        for size, outDegree in graphs:
+            graph = CS312CompactGraph(*generateNetwork(size, outDegree=outDegree))
+            solver = NetworkRoutingSolver()
+            solver.initializeNetwork(graph)
+            times = []
+            for queue in queues:
+                if queue == 'array' and size > ARRAY_LIMIT: times.append('-')
+                else: times.append('{:.4f}'.format(timeQueue(solver, queue, size)))
+            print('{:>7} {:>8} {:>8} '.format(kind, size, size * outDegree) +
+                  ' '.join('{:>9}'.format(t) for t in times))
+
+
+# Settled nodes and latency per point-to-point query for every search method, against
+# the full single-source _dijkstra the solver started out with
+def queryBenchmark( sizes ):
+    print('{:>8} {:>14} {:>14} {:>12}'.format('nodes', 'method', 'settled/query', 'ms/query'))
+    for size in sizes:
+        graph = CS312CompactGraph(*generateNetwork(size))
+        solver = NetworkRoutingSolver()
+        solver.initializeNetwork(graph)
+        solver.shortestPath(0, 1, method='astar') # precompute the heuristic scale
+        solver.buildContractionHierarchy()
+        random.seed(2)
+        pairs = [(random.randint(0, size-1), random.randint(0, size-1)) for _ in range(NUM_QUERIES)]
+
+        for method in ('full',) + SEARCH_METHODS:
+            settled = 0
+            seconds = 0.0
+            for src, dest in pairs:
+                if method == 'full':
+                    seconds += solver.computeShortestPaths(src, queue='heap', useCache=False)
+                else:
+                    seconds += solver.shortestPath(src, dest, queue='heap', method=method, useCache=False)
+                settled += solver.numSettled
+            print('{:>8} {:>14} {:>14.1f} {:>12.3f}'.format(
+                size, method, settled / NUM_QUERIES, 1000 * seconds / NUM_QUERIES))
+
+
+# Core-based Contraction Hierarchies: the share of the nodes left in the core, how many
+# of the nodes a query settles are in it, and the query latency against bidirectional
+# Dijkstra, then preprocessing time and index size. Every query is checked against the
+# full _dijkstra.
+def chBenchmark( sizes ):
+    print('{:>8} {:>8} {:>14} {:>10} {:>10} {:>10} {:>8} {:>10} {:>10} {:>9}'.format(
+        'nodes', 'core %', 'settled/query', 'in core', 'ch ms', 'bidir ms', 'speedup',
+        'prep sec', 'shortcuts', 'index MB'))
+    for size in sizes:
+        graph = CS312CompactGraph(*generateNetwork(size))
+        solver = NetworkRoutingSolver()
+        solver.initializeNetwork(graph)
+        prepTime = solver.buildContractionHierarchy()
+        hierarchy = solver.hierarchy
+
+        random.seed(2)
+        pairs = [(random.randint(0, size-1), random.randint(0, size-1)) for _ in range(NUM_QUERIES)]
+        settled = 0
+        coreSettled = 0
+        chSeconds = 0.0
+        bidirSeconds = 0.0
+        for src, dest in pairs:
+            chSeconds += solver.shortestPath(src, dest, method='ch', useCache=False)
+            settled += solver.numSettled
+            coreSettled += hierarchy.numCoreSettled
+            path = solver.getShortestPath(dest)
+            bidirSeconds += solver.shortestPath(src, dest, queue='heap', method='bidirectional', useCache=False)
+            solver.computeShortestPaths(src, queue='heap', useCache=False)
+            expected = solver.getShortestPath(dest)
+            assert path['cost'] == expected['cost'] and list(path['path']) == list(expected['path'])
+
+        print('{:>8} {:>8.1f} {:>14.1f} {:>10.1f} {:>10.3f} {:>10.3f} {:>8.2f} {:>10.2f} {:>10} {:>9.1f}'.format(
+            size, 100 * hierarchy.coreSize / size, settled / NUM_QUERIES, coreSettled / NUM_QUERIES,
+            1000 * chSeconds / NUM_QUERIES, 1000 * bidirSeconds / NUM_QUERIES, bidirSeconds / chSeconds,
+            prepTime, hierarchy.numShortcuts, hierarchy.numBytes() / 2**20))
+
+
+# kShortestPaths for a few values of k. Every path has to be simple, go from the source
+# to the destination and cost what its edges add up to, the costs can't go down, and the
+# first one has to be the path a full _dijkstra finds.
+def kPathsBenchmark( sizes ):
+    print('{:>8} {:>6} {:>8} {:>14} {:>12}'.format('nodes', 'k', 'paths', 'settled/query', 'ms/query'))
+    for size in sizes:
+        graph = CS312CompactGraph(*generateNetwork(size))
+        solver = NetworkRoutingSolver(0)
+        solver.initializeNetwork(graph)
+        graph.getReverseCSR() # built once per graph, so not part of the queries
+        random.seed(6)
+        pairs = [(random.randint(0, size-1), random.randint(0, size-1)) for _ in range(KPATHS_QUERIES)]
+
+        for k in KPATHS_KS:
+            numPaths = 0
+            settled = 0
+            seconds = 0.0
+            for src, dest in pairs:
+                t1 = time.perf_counter()
+                paths = solver.kShortestPaths(src, dest, k)
+                t2 = time.perf_counter()
+                seconds += t2 - t1
+                settled += solver.numSettled
+                numPaths += len(paths)
+
+                for i, (cost, path) in enumerate(paths):
+                    assert path[0] == src and path[-1] == dest and len(set(path)) == len(path)
+                    assert cost == solver._pathCost(path) and (i == 0 or cost >= paths[i - 1][0])
+                if paths:
+                    solver.computeShortestPaths(src, queue='heap', useCache=False)
+                    assert paths[0][0] == solver.distances[dest] and list(paths[0][1]) == list(solver.getPathNodes(dest)[1])
+            print('{:>8} {:>6} {:>8.1f} {:>14.1f} {:>12.3f}'.format(
+                size, k, numPaths / KPATHS_QUERIES, settled / KPATHS_QUERIES, 1000 * seconds / KPATHS_QUERIES))
+
+
+# computeManySources with different numbers of workers against calling
+# computeShortestPaths once per source (with the same heapq-based queue the workers
+# use), with every row checked against the serial one
+def batchBenchmark( workerCounts ):
+    graph = CS312CompactGraph(*generateNetwork(BATCH_SIZE))
+    solver = NetworkRoutingSolver(0)
+    solver.initializeNetwork(graph)
+    random.seed(3)
+    sources = [random.randint(0, BATCH_SIZE-1) for _ in range(BATCH_SOURCES)]
+
+    t1 = time.perf_counter()
+    expected = []
+    for src in sources:
+        solver.computeShortestPaths(src, queue='lazy')
+        expected.append(solver.distances)
+    t2 = time.perf_counter()
+    print('{:>8} {:>10} {:>12}'.format('workers', 'sec', 'sources/sec'))
+    print('{:>8} {:>10.2f} {:>12.1f}'.format('serial', t2 - t1, BATCH_SOURCES / (t2 - t1)))
+
+    for numWorkers in workerCounts:
+        t1 = time.perf_counter()
+        matrix = solver.computeManySources(sources, numWorkers=numWorkers)
+        t2 = time.perf_counter()
+        for row in range(BATCH_SOURCES): assert matrix[row].tolist() == expected[row]
+        print('{:>8} {:>10.2f} {:>12.1f}'.format(numWorkers, t2 - t1, BATCH_SOURCES / (t2 - t1)))
+        os.remove(matrix.filename)
+
+
+# DeltaStepping with different numbers of workers against the lazy heap Dijkstra, on
+# graphs from generateCompactNetwork (so this needs NumPy). Every run has to give the
+# same distances and prevNodes, and the pool is set up before the clock starts.
+def deltaBenchmark( workerCounts ):
+    from DeltaStepping import DeltaStepping
+    print('{:>9} {:>8} {:>10} {:>8} {:>9}'.format('nodes', 'workers', 'sec', 'phases', 'speedup'))
+    for size in DELTA_SIZES:
+        graph = generateCompactNetwork(size)
+        solver = NetworkRoutingSolver(0)
+        solver.initializeNetwork(graph)
+        random.seed(5)
+        sources = [random.randint(0, size-1) for _ in range(DELTA_SOURCES)]
+
+        expected = []
+        serial = 0.0
+        for src in sources:
+            serial += solver.computeShortestPaths(src, queue='lazy')
+            expected.append((solver.distances, [-1 if prev == None else prev for prev in solver.prevNodes]))
+        print('{:>9} {:>8} {:>10.3f} {:>8} {:>9}'.format(size, 'dijkstra', serial / DELTA_SOURCES, '-', '1.00'))
+
+        for numWorkers in workerCounts:
+            with DeltaStepping(graph, numWorkers=numWorkers) as engine:
+                seconds = 0.0
+                phases = 0
+                for src, (distances, prevNodes) in zip(sources, expected):
+                    t1 = time.perf_counter()
+                    result = engine.shortestPaths(src)
+                    t2 = time.perf_counter()
+                    assert result[0].tolist() == distances and result[1].tolist() == prevNodes
+                    seconds += t2 - t1
+                    phases += result[2]
+            print('{:>9} {:>8} {:>10.3f} {:>8} {:>9.2f}'.format(
+                size, numWorkers, seconds / DELTA_SOURCES, phases // DELTA_SOURCES, serial / seconds))
+        del graph, solver, expected
+
+
+# updateEdge on random edges, each getting between half and twice its length, against
+# recomputing the whole tree after every change. Both trees have to agree exactly.
+def updateBenchmark( sizes ):
+    print('{:>8} {:>14} {:>12} {:>12}'.format('nodes', 'settled/update', 'update ms', 'full ms'))
+    for size in sizes:
+        nodes, edgeList = generateNetwork(size)
+        graph = CS312CompactGraph(nodes, edgeList)
+        reference = CS312CompactGraph(nodes, edgeList)
+        solver = NetworkRoutingSolver(0)
+        solver.initializeNetwork(graph)
+        checker = NetworkRoutingSolver(0)
+        checker.initializeNetwork(reference)
+        solver.computeShortestPaths(0, queue='heap')
+
+        random.seed(4)
+        settled = 0
+        updateSeconds = 0.0
+        fullSeconds = 0.0
+        for _ in range(NUM_UPDATES):
+            u = random.randint(0, size-1)
+            v, length = random.choice(edgeList[u])
+            weight = length * random.uniform(0.5, 2.0)
+            updateSeconds += solver.updateEdge(u, v, weight)
+            settled += solver.numSettled
+            reference.setEdgeWeight(u, v, weight)
+            fullSeconds += checker.computeShortestPaths(0, queue='heap')
+            assert solver.distances == checker.distances and solver.prevNodes == checker.prevNodes
+
+        print('{:>8} {:>14.1f} {:>12.3f} {:>12.3f}'.format(
+            size, settled / NUM_UPDATES, 1000 * updateSeconds / NUM_UPDATES, 1000 * fullSeconds / NUM_UPDATES))
+
+
+# saveGraph and loadGraph, with a search on the loaded graph checked against the graph
+# it was saved from. The graphs come from generateCompactNetwork, so this needs NumPy.
+def fileBenchmark( sizes ):
+    print('{:>9} {:>9} {:>9} {:>10} {:>10}'.format('nodes', 'edges', 'MB', 'save sec', 'load ms'))
+    for size in sizes:
+        graph = generateCompactNetwork(size)
+        fd, path = tempfile.mkstemp(suffix='.graph')
+        os.close(fd)
+        try:
+            t1 = time.perf_counter()
+            saveGraph(graph, path)
+            t2 = time.perf_counter()
+            loaded = loadGraph(path)
+            t3 = time.perf_counter()
+
+            solver = NetworkRoutingSolver(0)
+            solver.initializeNetwork(loaded)
+            solver.computeShortestPaths(0, queue='heap')
+            distances = solver.distances
+            solver.initializeNetwork(graph)
+            solver.computeShortestPaths(0, queue='heap')
+            assert distances == solver.distances
+
+            print('{:>9} {:>9} {:>9.1f} {:>10.3f} {:>10.3f}'.format(
+                size, len(graph.targets), os.path.getsize(path) / 2**20, t2 - t1, 1000 * (t3 - t2)))
+            del loaded, solver, distances
+        finally:
+            os.remove(path)
+
+
+# generateNetwork followed by building a CS312CompactGraph, against generateCompactNetwork
+def generateBenchmark( sizes ):
+    print('{:>9} {:>14} {:>12} {:>14} {:>14}'.format(
+        'nodes', 'reference sec', 'numpy sec', 'ref mean edge', 'numpy mean edge'))
+    for size in sizes:
+        referenceTime = '-'
+        referenceMean = '-'
+        if size <= REFERENCE_LIMIT:
+            t1 = time.perf_counter()
+            graph = CS312CompactGraph(*generateNetwork(size))
+            t2 = time.perf_counter()
+            referenceTime = '{:.3f}'.format(t2 - t1)
+            referenceMean = '{:.2f}'.format(sum(graph.weights) / len(graph.weights))
+            del graph
+
+        t1 = time.perf_counter()
+        graph = generateCompactNetwork(size)
+        t2 = time.perf_counter()
+        print('{:>9} {:>14} {:>12.3f} {:>14} {:>14.2f}'.format(
+            size, referenceTime, t2 - t1, referenceMean, sum(graph.weights) / len(graph.weights)))
+        del graph
+
+
+# full is computeShortestPaths, the rest are shortestPath methods
+def runQuery( solver, mode, src, dest, queue, instrument=False ):
+    if mode == 'full': return solver.computeShortestPaths(src, queue=queue, useCache=False, instrument=instrument)
+    return solver.shortestPath(src, dest, queue=queue, method=mode, useCache=False, instrument=instrument)
+
+# One record of the suite: the queries are run once as they are for the time and settled
+# nodes, once instrumented for the queue operations, and the first one once more under
+# tracemalloc for the peak memory
+def suiteRecord( solver, size, outDegree, queue, mode, pairs ):
+    seconds = 0.0
+    settled = 0
+    for src, dest in pairs:
+        seconds += runQuery(solver, mode, src, dest, queue)
+        settled += solver.numSettled
+
+    stats = QueueStats()
+    for src, dest in pairs:
+        runQuery(solver, mode, src, dest, queue, instrument=True)
+        for op in stats.calls: stats.calls[op] += solver.queueStats.calls[op]
+        for op in stats.seconds: stats.seconds[op] += solver.queueStats.seconds[op]
+        stats.siftLevels += solver.queueStats.siftLevels
+
+    gc.collect()
+    tracemalloc.start()
+    runQuery(solver, mode, pairs[0][0], pairs[0][1], queue)
+    peakBytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    numQueries = len(pairs)
+    return {'nodes': size, 'edges': size * outDegree, 'outDegree': outDegree,
+            'queue': queue, 'mode': mode, 'queries': numQueries,
+            'secondsPerQuery': seconds / numQueries,
+            'queriesPerSec': numQueries / seconds if seconds > 0 else None,
+            'settledPerQuery': settled / numQueries,
+            'settledPerSec': settled / seconds if seconds > 0 else None,
+            'peakBytes': peakBytes,
+            'queueCalls': stats.calls,
+            'queueSeconds': stats.seconds,
+            'siftLevels': stats.siftLevels,
+            'queueOpsPerSec': stats.totalCalls() / stats.totalSeconds() if stats.totalSeconds() > 0 else None}
+
+# Every queue type with every search mode over SUITE_GRAPHS. A table goes to stdout and,
+# given a path, the records are written there as JSON.
+def suiteBenchmark( jsonPath=None ):
+    results = []
+    print('{:>7} {:>4} {:>6} {:>14} {:>10} {:>10} {:>9} {:>9} {:>9} {:>9} {:>10}'.format(
+        'nodes', 'deg', 'queue', 'mode', 'ms/query', 'settled', 'peak KB', 'ins ms', 'del ms', 'dec ms', 'levels'))
+    for size, outDegree in SUITE_GRAPHS:
+        graph = CS312CompactGraph(*generateNetwork(size, outDegree=outDegree))
+        solver = NetworkRoutingSolver(0)
+        solver.initializeNetwork(graph)
+        solver.shortestPath(0, 1, method='astar') # precompute the heuristic scale
+        random.seed(5)
+        pairs = [(random.randint(0, size-1), random.randint(0, size-1)) for _ in range(SUITE_QUERIES)]
+
+        for queue in QUEUE_TYPES:
+            if queue == 'array' and size > ARRAY_LIMIT: continue
+            for mode in SUITE_MODES:
+                record = suiteRecord(solver, size, outDegree, queue, mode, pairs)
+                results.append(record)
+                opMs = [1000 * record['queueSeconds'][op] / SUITE_QUERIES for op in QUEUE_OPERATIONS]
+                print('{:>7} {:>4} {:>6} {:>14} {:>10.3f} {:>10.1f} {:>9.1f} {:>9.3f} {:>9.3f} {:>9.3f} {:>10.1f}'.format(
+                    size, outDegree, queue, mode, 1000 * record['secondsPerQuery'], record['settledPerQuery'],
+                    record['peakBytes'] / 2**10, *opMs, record['siftLevels'] / SUITE_QUERIES))
+
+    if jsonPath != None:
+        with open(jsonPath, 'w') as f:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'results': results}, f, indent=1)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 2 and sys.argv[1] == 'memory':
+        memoryBenchmark([int(arg) for arg in sys.argv[2:]] or MEMORY_SIZES)
+    elif len(sys.argv) == 2 and sys.argv[1] == 'queues':
+        queueBenchmark()
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'queries':
+        queryBenchmark([int(arg) for arg in sys.argv[2:]] or QUERY_SIZES)
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'ch':
+        chBenchmark([int(arg) for arg in sys.argv[2:]] or CH_SIZES)
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'kpaths':
+        kPathsBenchmark([int(arg) for arg in sys.argv[2:]] or KPATHS_SIZES)
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'batch':
+        batchBenchmark([int(arg) for arg in sys.argv[2:]] or [1, 2, 4, os.cpu_count()])
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'delta':
+        deltaBenchmark([int(arg) for arg in sys.argv[2:]] or [1, 2, 4, os.cpu_count()])
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'updates':
+        updateBenchmark([int(arg) for arg in sys.argv[2:]] or UPDATE_SIZES)
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'files':
+        fileBenchmark([int(arg) for arg in sys.argv[2:]] or FILE_SIZES)
+    elif len(sys.argv) >= 2 and sys.argv[1] == 'generate':
+        generateBenchmark([int(arg) for arg in sys.argv[2:]] or GENERATE_SIZES)
+    elif len(sys.argv) in (2, 3) and sys.argv[1] == 'suite':
+        suiteBenchmark(sys.argv[2] if len(sys.argv) == 3 else None)
+    else:
+        print('usage: python3 RoutingBenchmark.py memory [sizes...]')
+        print('       python3 RoutingBenchmark.py queues')
+        print('       python3 RoutingBenchmark.py queries [sizes...]')
+        print('       python3 RoutingBenchmark.py ch [sizes...]')
+        print('       python3 RoutingBenchmark.py kpaths [sizes...]')
+        print('       python3 RoutingBenchmark.py batch [workers...]')
+        print('       python3 RoutingBenchmark.py delta [workers...]')
+        print('       python3 RoutingBenchmark.py updates [sizes...]')
+        print('       python3 RoutingBenchmark.py files [sizes...]')
+        print('       python3 RoutingBenchmark.py generate [sizes...]')
+        print('       python3 RoutingBenchmark.py suite [results.json]')
+        sys.exit(1)
@@ -0,0 +1,33 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+# NumPy arrays in shared memory, for handing a graph to a pool of worker processes
+# without pickling it to each of them. The parent shares each array, passes the specs
+# to the pool's initializer, and every worker attaches to the same blocks.
+
+
+# what a worker process keeps between tasks, set up by the pool's initializer
+worker = {}
+
+
+# O(n) time
+# Copies values into a new shared memory block as a NumPy array of dtype. Returns
+# (block, the array over it, spec), spec being what attachArrays needs to find it. The
+# caller has to close() and unlink() the block, after letting go of the array.
+def shareArray( values, dtype ):
+    values = np.asarray(values, dtype=dtype)
+    block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    shared = np.ndarray(len(values), dtype=values.dtype, buffer=block.buf)
+    shared[:] = values
+    return block, shared, (block.name, values.dtype.str, len(values))
+
+# In a worker: maps the blocks the specs describe and puts NumPy arrays over them in
+# worker['arrays'], which it also returns. The parent owns the blocks and unlinks them.
+def attachArrays( specs ):
+    blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in specs]
+    worker['blocks'] = blocks
+    worker['arrays'] = [np.ndarray(length, dtype=dtype, buffer=block.buf)
+                        for block, (_, dtype, length) in zip(blocks, specs)]
+    return worker['arrays']
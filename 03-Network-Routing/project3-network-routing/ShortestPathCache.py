@@ -0,0 +1,68 @@
+from array import array
+from collections import OrderedDict
+
+# How much memory the cached trees may use by default, in bytes
+DEFAULT_CACHE_BYTES = 64 * 2**20
+
+
+# One shortest-path tree, stored as two flat arrays: the distance of every node from
+# source, and the previous node on its shortest path (-1 for the source and for
+# unreachable nodes). O(|V|) space, 16 bytes per node.
+class ShortestPathTree:
+    __slots__ = ('source', 'distances', 'prevNodes')
+
+    def __init__( self, source, distances, prevNodes ):
+        self.source = source
+        self.distances = array('d', distances)
+        self.prevNodes = array('q', [-1 if prev == None else prev for prev in prevNodes])
+
+    def numBytes( self ):
+        return (len(self.distances) * self.distances.itemsize +
+                len(self.prevNodes) * self.prevNodes.itemsize)
+
+
+# Least-recently-used cache of shortest-path trees keyed by source node. Trees are
+# evicted oldest first once the total size would go over maxBytes. Nothing in here
+# knows about the graph, so whoever changes the graph has to call clear().
+class ShortestPathCache:
+    def __init__( self, maxBytes=DEFAULT_CACHE_BYTES ):
+        self.maxBytes = maxBytes
+        self.trees = OrderedDict() # source -> ShortestPathTree, least recently used first
+        self.numBytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__( self ):
+        return len(self.trees)
+
+    def __contains__( self, source ):
+        return source in self.trees
+
+    # O(1) time
+    # returns the cached tree for source, or None
+    def get( self, source ):
+        tree = self.trees.get(source)
+        if tree == None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.trees.move_to_end(source)
+        return tree
+
+    # O(|V|) time
+    # stores a tree, evicting old ones as needed, and returns it. A tree bigger than
+    # the whole budget is returned without being cached.
+    def put( self, source, distances, prevNodes ):
+        tree = ShortestPathTree(source, distances, prevNodes)
+        if source in self.trees: self.numBytes -= self.trees.pop(source).numBytes()
+        if tree.numBytes() > self.maxBytes: return tree
+
+        while self.numBytes + tree.numBytes() > self.maxBytes:
+            self.numBytes -= self.trees.popitem(last=False)[1].numBytes()
+        self.trees[source] = tree
+        self.numBytes += tree.numBytes()
+        return tree
+
+    def clear( self ):
+        self.trees.clear()
+        self.numBytes = 0
@@ -0,0 +1,198 @@
+from array import array
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from CS312Graph import expandRanges
+
+
+# the grid gets about one cell per this many nodes
+NODES_PER_CELL = 2
+
+
+# Uniform grid over the node locations, for finding the nodes nearest to a point without
+# scanning them all. The bounding box of the nodes is cut into about
+# |V| / NODES_PER_CELL cells, and the ids of the nodes in each cell are stored CSR-style:
+# cell c holds cellNodes[cellOffsets[c]:cellOffsets[c + 1]], in increasing id order.
+# A nearest query looks at rings of cells around the point, outwards, and stops once the
+# next ring can't hold anything closer. Points outside the bounding box work too.
+#
+# Ties go to the lowest node id, the node a scan over all of them in id order keeps.
+class SpatialIndex:
+    # O(|V|) time and space
+    def __init__( self, xs, ys ):
+        self.xs = xs
+        self.ys = ys
+        numNodes = len(xs)
+        if numNodes == 0: raise ValueError('Can\'t index an empty set of nodes')
+
+        self.minX, self.maxX = min(xs), max(xs)
+        self.minY, self.maxY = min(ys), max(ys)
+        width = max(self.maxX - self.minX, 1e-12)
+        height = max(self.maxY - self.minY, 1e-12)
+
+        # cells about as square as the bounding box allows
+        numCells = max(1, numNodes // NODES_PER_CELL)
+        self.cols = min(numCells, max(1, round(math.sqrt(numCells * width / height))))
+        self.rows = max(1, math.ceil(numCells / self.cols))
+        self.cellWidth = width / self.cols
+        self.cellHeight = height / self.rows
+
+        if np is not None: self._sortByCellNumPy()
+        else: self._sortByCell()
+
+    # O(|V|) time
+    # counting sort of the nodes by cell into cellOffsets/cellNodes
+    def _sortByCell( self ):
+        xs, ys = self.xs, self.ys
+        numNodes = len(xs)
+        cells = array('q', [self._cellOf(xs[i], ys[i]) for i in range(numNodes)])
+        offsets = array('q', [0]) * (self.rows * self.cols + 1)
+        for c in cells: offsets[c + 1] += 1
+        for c in range(self.rows * self.cols): offsets[c + 1] += offsets[c]
+        nodes = array('q', [0]) * numNodes
+        nextSlot = offsets[:-1]
+        for i in range(numNodes):
+            nodes[nextSlot[cells[i]]] = i
+            nextSlot[cells[i]] += 1
+        self.cellOffsets = offsets
+        self.cellNodes = nodes
+
+    # O(|V| log |V|) time, but all of it in NumPy
+    # the same as _sortByCell: a stable sort keeps ids increasing within each cell
+    def _sortByCellNumPy( self ):
+        xs = np.asarray(self.xs, dtype=np.float64)
+        ys = np.asarray(self.ys, dtype=np.float64)
+        cols = np.clip(((xs - self.minX) / self.cellWidth).astype(np.int64), 0, self.cols - 1)
+        rows = np.clip(((ys - self.minY) / self.cellHeight).astype(np.int64), 0, self.rows - 1)
+        cells = rows * self.cols + cols
+        offsets = np.zeros(self.rows * self.cols + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cells, minlength=self.rows * self.cols), out=offsets[1:])
+        self.cellOffsets = array('q', offsets.tobytes())
+        self.cellNodes = array('q', np.argsort(cells, kind='stable').astype(np.int64).tobytes())
+
+    # (column, row) of the cell a point falls in, points outside going to the nearest cell
+    def _colRow( self, x, y ):
+        col = min(self.cols - 1, max(0, int((x - self.minX) / self.cellWidth)))
+        row = min(self.rows - 1, max(0, int((y - self.minY) / self.cellHeight)))
+        return col, row
+
+    def _cellOf( self, x, y ):
+        col, row = self._colRow(x, y)
+        return row * self.cols + col
+
+    # the cells at Chebyshev distance ring from (col, row) that are in the grid
+    def _ring( self, col, row, ring ):
+        if ring == 0:
+            yield row * self.cols + col
+            return
+        for c in range(max(0, col - ring), min(self.cols, col + ring + 1)):
+            if row - ring >= 0: yield (row - ring) * self.cols + c
+            if row + ring < self.rows: yield (row + ring) * self.cols + c
+        for r in range(max(0, row - ring + 1), min(self.rows, row + ring)):
+            if col - ring >= 0: yield r * self.cols + col - ring
+            if col + ring < self.cols: yield r * self.cols + col + ring
+
+    # O(1) expected time for points in or near the bounding box
+    # Returns (node id, distance) of the node nearest to (x, y)
+    def nearest( self, x, y ):
+        xs, ys, offsets, nodes = self.xs, self.ys, self.cellOffsets, self.cellNodes
+        col, row = self._colRow(x, y)
+        maxRing = max(col, self.cols - 1 - col, row, self.rows - 1 - row)
+        cellSize = min(self.cellWidth, self.cellHeight)
+
+        best = (math.inf, -1)
+        for ring in range(maxRing + 1):
+            for cell in self._ring(col, row, ring):
+                for i in range(offsets[cell], offsets[cell + 1]):
+                    node = nodes[i]
+                    dx = xs[node] - x
+                    dy = ys[node] - y
+                    best = min(best, (dx*dx + dy*dy, node))
+            # everything past this ring is at least ring cells away
+            if best[0] <= (ring * cellSize)**2: break
+        return best[1], math.sqrt(best[0])
+
+    # O(nodes in the cells the circle touches) time
+    # Returns the ids of the nodes within radius of (x, y), in increasing order
+    def withinRadius( self, x, y, radius ):
+        xs, ys, offsets, nodes = self.xs, self.ys, self.cellOffsets, self.cellNodes
+        col1, row1 = self._colRow(x - radius, y - radius)
+        col2, row2 = self._colRow(x + radius, y + radius)
+        found = []
+        for row in range(row1, row2 + 1):
+            for cell in range(row * self.cols + col1, row * self.cols + col2 + 1):
+                for i in range(offsets[cell], offsets[cell + 1]):
+                    node = nodes[i]
+                    dx = xs[node] - x
+                    dy = ys[node] - y
+                    if dx*dx + dy*dy <= radius*radius: found.append(node)
+        found.sort()
+        return found
+
+    # Returns (node ids, distances) of the nodes nearest to each (xs[i], ys[i]), the same
+    # as calling nearest on each point. With NumPy the points go through the rings all at
+    # once, as NumPy arrays in and out; without it they're looked up one at a time, as lists.
+    def nearestMany( self, xs, ys ):
+        if np is None:
+            found = [self.nearest(x, y) for x, y in zip(xs, ys)]
+            return [node for node, _ in found], [dist for _, dist in found]
+
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        nodeXs = np.asarray(self.xs, dtype=np.float64)
+        nodeYs = np.asarray(self.ys, dtype=np.float64)
+        offsets = np.asarray(self.cellOffsets, dtype=np.int64)
+        cellNodes = np.asarray(self.cellNodes, dtype=np.int64)
+        cols = np.clip(((xs - self.minX) / self.cellWidth).astype(np.int64), 0, self.cols - 1)
+        rows = np.clip(((ys - self.minY) / self.cellHeight).astype(np.int64), 0, self.rows - 1)
+        cellSize = min(self.cellWidth, self.cellHeight)
+
+        bestDists = np.full(len(xs), np.inf)
+        bestNodes = np.full(len(xs), -1, dtype=np.int64)
+        pending = np.arange(len(xs))
+        ring = 0
+        while len(pending) > 0:
+            # the (column, row) steps to every cell of this ring, for every pending point
+            if ring == 0: steps = np.zeros((1, 2), dtype=np.int64)
+            else:
+                side = np.arange(-ring, ring + 1)
+                inner = np.arange(-ring + 1, ring)
+                steps = np.concatenate([np.stack([side, np.full_like(side, -ring)], 1),
+                                        np.stack([side, np.full_like(side, ring)], 1),
+                                        np.stack([np.full_like(inner, -ring), inner], 1),
+                                        np.stack([np.full_like(inner, ring), inner], 1)])
+            queryIds = np.repeat(pending, len(steps))
+            cellCols = cols[queryIds] + np.tile(steps[:, 0], len(pending))
+            cellRows = rows[queryIds] + np.tile(steps[:, 1], len(pending))
+            inGrid = (cellCols >= 0) & (cellCols < self.cols) & (cellRows >= 0) & (cellRows < self.rows)
+            queryIds = queryIds[inGrid]
+            cells = cellRows[inGrid] * self.cols + cellCols[inGrid]
+
+            # every node in those cells against its query point
+            starts = offsets[cells]
+            counts = offsets[cells + 1] - starts
+            slots = expandRanges(starts, counts)
+            queryIds = np.repeat(queryIds, counts)
+            nodes = cellNodes[slots]
+            dists = (nodeXs[nodes] - xs[queryIds])**2 + (nodeYs[nodes] - ys[queryIds])**2
+
+            # the best one per point, ties to the lowest id, kept if it beats the old best
+            order = np.lexsort((nodes, dists, queryIds))
+            queryIds, nodes, dists = queryIds[order], nodes[order], dists[order]
+            first = np.ones(len(queryIds), dtype=bool)
+            first[1:] = queryIds[1:] != queryIds[:-1]
+            queryIds, nodes, dists = queryIds[first], nodes[first], dists[first]
+            better = (dists < bestDists[queryIds]) | ((dists == bestDists[queryIds]) & (nodes < bestNodes[queryIds]))
+            bestDists[queryIds[better]] = dists[better]
+            bestNodes[queryIds[better]] = nodes[better]
+
+            maxRings = np.maximum.reduce([cols[pending], self.cols - 1 - cols[pending],
+                                          rows[pending], self.rows - 1 - rows[pending]])
+            pending = pending[(bestDists[pending] > (ring * cellSize)**2) & (maxRings > ring)]
+            ring += 1
+
+        return bestNodes, np.sqrt(bestDists)
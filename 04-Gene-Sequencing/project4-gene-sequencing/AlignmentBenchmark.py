@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+# Headless benchmarks for the gene sequencing project, with the same scoring as
+# GeneSequencing.py but without Qt. The genomes in genomes.txt are only about 31k letters
+# long, so the sequences here are made up: a random sequence and a mutated copy of it.
+#
+# usage: python3 AlignmentBenchmark.py kernel [lengths...]
+
+import random
+import sys
+import time
+
+import SequenceComparer as comparer
+
+
+# the scoring GeneSequencing.py uses
+MATCH = -3
+INDEL = 5
+SUB = 1
+
+KERNEL_LENGTHS = [1000, 3000, 10000, 30000, 100000]
+# the pure Python versions take about a minute at 10k, and the full table takes
+# 9 bytes a cell, so they're left out above these lengths
+PYTHON_LIMIT = 10000
+TABLE_LIMIT = 3000
+
+
+# O(length) time
+# A random sequence and a copy of it with about a tenth of its letters substituted, and
+# a letter deleted or inserted about every 50, like two related genomes
+def relatedSequences(length, seed=0):
+    random.seed(seed)
+    seq1 = ''.join(random.choice('acgt') for _ in range(length))
+    seq2 = []
+    for letter in seq1:
+        chance = random.random()
+        if chance < 0.02: continue # deleted
+        elif chance < 0.04: seq2.append(random.choice('acgt') + letter) # inserted
+        elif chance < 0.14: seq2.append(random.choice('acgt')) # substituted
+        else: seq2.append(letter)
+    return seq1, ''.join(seq2)[:length]
+
+# Returns (cost, alignments, seconds for the cost, seconds for the alignments)
+def timeAlignment(seq1, seq2, linearMemory):
+    t1 = time.perf_counter()
+    result = comparer.SequenceComparer(seq1, seq2, len(seq1), float('inf'), MATCH, INDEL, SUB, linearMemory)
+    t2 = time.perf_counter()
+    alignments = result.getAlignments()
+    t3 = time.perf_counter()
+    return result.getCost(), alignments, t2 - t1, t3 - t2
+
+# timeAlignment with the NumPy row kernel switched off
+def timeAlignmentPython(seq1, seq2, linearMemory):
+    savedNumPy, comparer.np = comparer.np, None
+    try: return timeAlignment(seq1, seq2, linearMemory)
+    finally: comparer.np = savedNumPy
+
+# The unrestricted alignment of two related sequences of each length, as a full table and
+# in linear memory, in pure Python against the NumPy row kernel. All of them have to come
+# out with the same cost and alignments.
+def kernelBenchmark(lengths):
+    if comparer.np is None: raise ImportError('The kernel benchmark needs NumPy')
+    print('{:>7} {:>7} {:>10} {:>10} {:>10} {:>10} {:>9}'.format(
+        'length', 'memory', 'cost', 'python', 'numpy', 'align', 'speedup'))
+    for length in lengths:
+        seq1, seq2 = relatedSequences(length)
+        for linearMemory in (False, True):
+            if not linearMemory and length > TABLE_LIMIT: continue
+            cost, alignments, costSeconds, alignSeconds = timeAlignment(seq1, seq2, linearMemory)
+            if length <= PYTHON_LIMIT:
+                expected = timeAlignmentPython(seq1, seq2, linearMemory)
+                assert expected[:2] == (cost, alignments)
+                pythonSeconds = expected[2] + expected[3]
+                python, speedup = '{:.3f}'.format(pythonSeconds), '{:.1f}'.format(pythonSeconds / (costSeconds + alignSeconds))
+            else: python, speedup = '-', '-'
+            print('{:>7} {:>7} {:>10} {:>10} {:>10.3f} {:>10.3f} {:>9}'.format(
+                length, 'linear' if linearMemory else 'table', cost, python, costSeconds, alignSeconds, speedup))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 2 and sys.argv[1] == 'kernel':
+        kernelBenchmark([int(arg) for arg in sys.argv[2:]] or KERNEL_LENGTHS)
+    else:
+        print('usage: python3 AlignmentBenchmark.py kernel [lengths...]')
+        sys.exit(1)
@@ -21,6 +21,10 @@ MATCH = -3
 INDEL = 5
 SUB = 1
 
+# Unrestricted alignments whose table would have more cells than this are done in linear
+# memory instead (same cost and alignment, see SequenceComparer)
+MAX_TABLE_CELLS = 4000000
+
 class GeneSequencing:
 
 	def __init__( self ):
@@ -30,12 +34,19 @@ class GeneSequencing:
 # you whether you should compute a banded alignment or full alignment, and _align_length_ tells you
 # how many base pairs to use in computing the alignment
 
-	def align( self, seq1: str, seq2: str, banded: bool, align_length: int):
+# With _cost_only_, only the cost is worked out, keeping two rows of the table (or band), and the
+# result has an 'alignments' function in place of the alignments, which does the work for them
+# when called and returns (seqi_first100, seqj_first100)
+
+	def align( self, seq1: str, seq2: str, banded: bool, align_length: int, cost_only: bool = False):
 
+		numCells = (min(len(seq1), align_length) + 1) * (min(len(seq2), align_length) + 1)
 		seqComp = SequenceComparer(seq1, seq2, align_length,
-					MAXINDELS if banded else float('inf'), MATCH, INDEL, SUB)
+					MAXINDELS if banded else float('inf'), MATCH, INDEL, SUB,
+					linearMemory = numCells > MAX_TABLE_CELLS, costOnly = cost_only)
 		
 		score = seqComp.getCost()
+		if cost_only: return {'align_cost':score, 'alignments':seqComp.getAlignments}
 		alignment1, alignment2 = seqComp.getAlignments()
 		# if len(seq1) < 100 and len(seq2) < 100: print(seqComp)
 		# print(alignment1)
@@ -51,8 +51,9 @@ class Proj4GUI( QMainWindow ):
 				if(j < i):
 					s = {}
 				else:
+					# only the costs here; cellClicked works out the alignment of a pair when it's shown
 					s = self.solver.align(sequences[i], sequences[j], banded=self.banded.isChecked(),
-													align_length=int(self.alignLength.text()))
+													align_length=int(self.alignLength.text()), cost_only=True)
 					self.table.item(i,j).setText('{}'.format(int(s['align_cost']) if s['align_cost'] \
 																					 != math.inf else s['align_cost']))
 					app.processEvents()
@@ -109,6 +110,8 @@ class Proj4GUI( QMainWindow ):
 			self.seq1_name.setText( '{}'.format(self.seqs[i][1]) )
 			self.seq2_name.setText( '{}'.format(self.seqs[j][1]) )
 			results = self.processed_results[i][j]
+			if 'seqi_first100' not in results:
+				results['seqi_first100'], results['seqj_first100'] = results['alignments']()
 			self.seq1_chars.setText( '{}'.format(results['seqi_first100']) )
 			self.seq2_chars.setText( '{}'.format(results['seqj_first100']) )
 
@@ -1,41 +1,34 @@
-from collections import namedtuple
+from array import array
 
-class Entry:
-    Location = namedtuple('Location', ['row', 'col'])
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-    def __init__(self, loc: Location, letter1: str, letter2: str,
-                 cost = float('inf'), prev: Location = None):
-        self.loc = loc
-        self.letter1 = letter1
-        self.letter2 = letter2
-        self.cost = cost
-        self.prev = prev
-        self.isMatch = False
-        self.prevDirection = None
-
-    def __str__(self):
-        # return f"{self.cost}"
-        # return f"[{self.letter1},{self.letter2}]"
-        # if self.prev != None: return f"{self.cost}, ({self.prev.row},{self.prev.col}), [{self.letter1},{self.letter2}]"
-        # else: return f"{self.cost}, (-,-), [{self.letter1},{self.letter2}]"
-        if self.prev == None: direction = "*"
-        elif self.prevDirection == "left": direction = "←"
-        elif self.prevDirection == "up": direction = "↑"
-        elif self.prevDirection == "diag": direction = "⇖" if self.isMatch else "↖"
-        else: direction = "(" + str(self.prev.row) + "," + str(self.prev.col) + ")"
-        return f"{direction} {self.cost:02d}"
-        # l1 = " " if self.letter1 == "" else self.letter1
-        # l2 = " " if self.letter2 == "" else self.letter2
-        # return f"{direction} {self.cost:02d} [{l1},{l2}]"
+# The traceback direction of each cell of the table, one byte per cell. NO_ENTRY marks the
+# cells outside the band, START the corner, and MATCH_DIAG a diagonal move between equal
+# letters (the same move as DIAG, only shown differently by __str__()).
+NO_ENTRY, START, LEFT, UP, DIAG, MATCH_DIAG = range(6)
+DIRECTION_ARROWS = " *←↑↖⇖"
 
 # Unrestricted Total: O(mn) time, O(mn) space
 # Banded Total: O(kn) time, O(kn) space
+# Linear Memory Total: O(mn) time, O(m + n) space
+# Cost Only Total: O(mn) time, O(n) space | Banded: O(kn) time, O(k) space
+# With NumPy, the unrestricted versions work a whole row at a time (see _nextRowNumPy())
 class SequenceComparer:
-
-    # accesses _populateTable()
+    # the linear memory mode fills a whole table once a subproblem has no more cells than this
+    LINEAR_BASE_CELLS = 4096
+
+    # accesses _populateTable(), or _forwardPass() with linearMemory
+    # linearMemory only applies to the unrestricted version: instead of the m x n table, the
+    # cost comes from a pass that keeps two rows, and the alignment from Hirschberg's
+    # divide and conquer (see _linearPath()). Both come out exactly as the table gives them.
+    # costOnly keeps just two rows, of the table or the band, for the cost; getAlignments()
+    # then does the work for the alignments when (and if) it's called.
     def __init__(self, seq1, seq2,
                  maxAlignLength = float('inf'), maxVariation = float('inf'),
-                 MATCH = 0, INDEL = 5, SUB = 1):
+                 MATCH = 0, INDEL = 5, SUB = 1, linearMemory = False, costOnly = False):
         self.seq1 = seq1[:maxAlignLength] # let seq1 have length m
         self.seq2 = seq2[:maxAlignLength] # let seq2 have length n
         self.didSwitch = False
@@ -44,6 +37,10 @@ class SequenceComparer:
             self.seq2 = seq1[:maxAlignLength]
             self.didSwitch = True
         self.maxAlignLength = maxAlignLength
+        # The banded table keeps a column on each side of the diagonal, and the cells at its
+        # edges count on that for their neighbours. A narrower band would have them read
+        # outside the band, into the next or previous row of the flat arrays.
+        if maxVariation < 1: raise ValueError(f"maxVariation must be at least 1, not {maxVariation}")
         self.maxVariation = maxVariation
         self.bandwidth = self.maxVariation * 2 + 1 # let bandwidth == k
         self.banded = self.bandwidth != float('inf')
@@ -52,149 +49,222 @@ class SequenceComparer:
         self.INDEL = INDEL
         self.SUB = SUB
 
+        if np is not None and not self.banded:
+            # seq2 as NumPy code points, and INDEL times each column number
+            self.seq2Codes = np.frombuffer(self.seq2.encode('utf-32-le'), dtype=np.uint32)
+            self.indelSteps = INDEL * np.arange(len(self.seq2) + 1, dtype=np.int64)
+
+        self.costOnly = costOnly
+        self.linearMemory = (linearMemory or costOnly) and not self.banded
+        if self.linearMemory:
+            self.costs = self.directions = None
+            # the top level split of _linearPath() comes out of the same pass as the cost,
+            # except for costOnly, where the middle row is past the end so nothing's tracked
+            rows, cols = len(self.seq1), len(self.seq2)
+            midRow = rows + 1 if costOnly else rows // 2
+            if np is not None: costs, crossCols = self._forwardPassNumPy(0, 0, rows, cols, midRow)
+            else: costs, crossCols = self._forwardPass(0, 0, rows, cols, midRow)
+            self.linearCost = int(costs[-1])
+            self.linearCrossCol = None if costOnly else int(crossCols[-1])
+            return
+
         # banded version should be 7 entries wide for this project
         tableWidth = min(len(self.seq2), self.bandwidth - 1, maxAlignLength)
         tableLength = min(len(self.seq1), maxAlignLength)
+        self.tableRows = tableLength + 1
+        self.tableCols = tableWidth + 1
         # For unrestricted, this table is m x n. Nothing else needs space proportional to m,n or k.
         # For banded, this table is k x n. Nothing else needs space proportional to n or k.
         # The overall space requirement for this comparer object is either O(mn) or O(kn), respectively.
-        self.dpTable = [[None for _ in range(tableWidth + 1)] for _ in range(tableLength + 1)]
+        # The table is kept flat, row after row: cell (row, col) is at row * tableCols + col,
+        # with its cost in costs and its traceback direction in directions (9 bytes a cell).
+        # costOnly (only reaching here banded) keeps two rows and goes back and forth between
+        # them, so cell (row, col) is at (row % keptRows) * tableCols + col.
+        self.keptRows = min(2, self.tableRows) if costOnly else self.tableRows
+        self._allocateTable()
         self._populateTable() # this function call takes up most of the time
     
     # irrelevant
     def __str__(self):
         dpTableString = ""
-        for row in self.dpTable:
-            row_string = " | ".join(map(str, row))
-            dpTableString += "\t\t[" + row_string + "]\n"
+        if self.directions == None: dpTableString = "\t\t(none kept in linear memory mode)\n"
+        elif self.keptRows < self.tableRows: dpTableString = "\t\t(only two rows kept in cost only mode)\n"
+        else:
+            for row in range(self.tableRows):
+                row_string = " | ".join(self._cellString(row, col) for col in range(self.tableCols))
+                dpTableString += "\t\t[" + row_string + "]\n"
 
         return f"SequenceComparer:\n\tseq1 - {self.seq1} ({len(self.seq1)})\n\tseq2 - {self.seq2} ({len(self.seq2)})\n\tdpTable: \n{dpTableString}"
 
+    # a cell as __str__() shows it: its direction and cost, or None outside the band
+    def _cellString(self, row, col):
+        cell = row * self.tableCols + col
+        if self.directions[cell] == NO_ENTRY: return "None"
+        return f"{DIRECTION_ARROWS[self.directions[cell]]} {self.costs[cell]:02d}"
+
+    # the costs and directions for keptRows rows of the table, every cell NO_ENTRY
+    def _allocateTable(self):
+        numCells = self.keptRows * self.tableCols
+        self.costs = array('q', [0]) * numCells
+        self.directions = bytearray(numCells)
+
     # Unrestricted: O(mn) time | Banded: O(kn) time
-    # accesses _fillOneCell()
+    # accesses _fillOneCell(), or _populateTableNumPy() for unrestricted with NumPy
     def _populateTable(self):
-        
-        for row in range(len(self.dpTable)): # will repeat n times
+        if np is not None and not self.banded: return self._populateTableNumPy()
+
+        for row in range(self.tableRows): # will repeat n times
             if row > self.maxAlignLength: return
+            if self.keptRows < self.tableRows:
+                # the row goes where a row from before was, which might have cells this one doesn't
+                start = (row % self.keptRows) * self.tableCols
+                self.directions[start:start + self.tableCols] = bytes(self.tableCols)
 
             # will repeat m times for unrestriced, k times for banded
-            for col in range(len(self.dpTable[row])):
+            for col in range(self.tableCols):
                 if col > self.maxAlignLength: break
                 self._fillOneCell(row, col)
 
+    # O(mn) time, with a NumPy operation per row instead of a Python call per cell
+    # the unrestricted table through _nextRowNumPy(), the same as _fillOneCell() fills it
+    def _populateTableNumPy(self):
+        costs = np.frombuffer(self.costs, dtype=np.int64).reshape(self.tableRows, self.tableCols)
+        directions = np.frombuffer(self.directions, dtype=np.uint8).reshape(self.tableRows, self.tableCols)
+        costs[0] = self.indelSteps
+        directions[0] = LEFT
+        directions[0, 0] = START
+
+        scores = self._scoresNumPy(0, 0, self.tableRows - 1, self.tableCols - 1)
+        for row in range(1, self.tableRows): # will repeat m times
+            matches, rowScores = scores[self.seq1[row - 1]]
+            rowCosts, rowDirections = self._nextRowNumPy(costs[row - 1], rowScores)
+            rowDirections[1:][(rowDirections[1:] == DIAG) & matches] = MATCH_DIAG
+            costs[row] = rowCosts
+            directions[row] = rowDirections
+
+    # O(1) time
+    # the letters of seq1 and seq2 that cell (row, col) of the table stands for, or "" for
+    # the first row or column. In the banded table, the rows past the initial wedge are
+    # moved over so that the band stays in the table's columns.
+    def _letters(self, row, col):
+        letter1 = self.seq1[row - 1] if row != 0 else ""
+        if self.banded and row > self.maxVariation:
+            if row > len(self.seq2) - self.maxVariation:
+                return letter1, self.seq2[len(self.seq2) - self.bandwidth + col]
+            else: return letter1, self.seq2[row + col - self.maxVariation - 1]
+        return letter1, self.seq2[col - 1] if col != 0 else ""
+
+    # O(1) time
+    # how far the previous row's table columns are moved over from this row's: by one for
+    # the banded rows between the initial wedge and the end of seq2
+    def _shift(self, row):
+        if self.banded and self.maxVariation < row <= len(self.seq2) - self.maxVariation: return 1
+        else: return 0
+
     # O(1) time
     # accesses _determineCost()
     def _fillOneCell(self, row, col):
-        if row == 0:
-            if col == 0:
-                self.dpTable[col][row] = Entry(Entry.Location(row, col), "", "", 0)
-                return
-            else: currEntry = Entry(Entry.Location(row, col), "", self.seq2[col - 1])
-        else:
-            if col == 0: currEntry = Entry(Entry.Location(row, col), self.seq1[row - 1], "")
-            else: currEntry = Entry(Entry.Location(row, col), self.seq1[row - 1], self.seq2[col - 1])
+        if row == 0 and col == 0:
+            self.costs[0] = 0
+            self.directions[0] = START
+            return
+        letter1, letter2 = self._letters(row, col)
+        isMatch = letter1 == letter2
 
         if not self.banded: # the default option
-            if row == 0:
-                if col == 0: raise IndexError("This should already have been covered")
-                else: self._determineCost(currEntry, True, False, False)
-            else:
-                if col == 0: self._determineCost(currEntry, False, True, False)
-                else: self._determineCost(currEntry)
+            if row == 0: self._determineCost(row, col, isMatch, True, False, False)
+            elif col == 0: self._determineCost(row, col, isMatch, False, True, False)
+            else: self._determineCost(row, col, isMatch)
 
         else: # if it's banded
             if row == 0: # first row
-                if col == 0: raise IndexError("This should already have been covered")
-                elif col > self.maxVariation: return # end of column
-                else: self._determineCost(currEntry, True, False, False)
+                if col > self.maxVariation: return # end of column
+                else: self._determineCost(row, col, isMatch, True, False, False)
 
             elif row <= self.maxVariation: # initial wedge for banded
-                if col == 0: self._determineCost(currEntry, False, True, False)
-                elif col == self.maxVariation + row: self._determineCost(currEntry, True, False, True)
+                if col == 0: self._determineCost(row, col, isMatch, False, True, False)
+                elif col == self.maxVariation + row: self._determineCost(row, col, isMatch, True, False, True)
                 elif col > self.maxVariation + row: return # cell doesn't exist
-                else: self._determineCost(currEntry, True, True, True)
+                else: self._determineCost(row, col, isMatch, True, True, True)
 
             elif row > len(self.seq2) - self.maxVariation:
-                currEntry.letter2 = self.seq2[len(self.seq2) - self.bandwidth + col]
-
                 firstViableCol = row - len(self.seq2) + self.maxVariation
 
                 if col < firstViableCol: return
-                elif col == firstViableCol: self._determineCost(currEntry, False, True, True)
-                else: self._determineCost(currEntry, True, True, True)
+                elif col == firstViableCol: self._determineCost(row, col, isMatch, False, True, True)
+                else: self._determineCost(row, col, isMatch, True, True, True)
 
             else: # row is greater than self.maxVariation and less than self.maxAlignLength
-                currEntry.letter2 = self.seq2[row + col - self.maxVariation - 1]
-
-                if col == 0: self._determineCost(currEntry, False, True, True, 1)
-                elif col == self.bandwidth - 1: self._determineCost(currEntry, True, False, True, 1)
+                if col == 0: self._determineCost(row, col, isMatch, False, True, True, 1)
+                elif col == self.bandwidth - 1: self._determineCost(row, col, isMatch, True, False, True, 1)
                 elif col >= self.bandwidth: return # cell doesn't exist
-                else: self._determineCost(currEntry, True, True, True, 1)
-        
-        self.dpTable[row][col] = currEntry
+                else: self._determineCost(row, col, isMatch, True, True, True, 1)
 
     # O(1) time 
     # calculates cost of one cell
     # accesses _findMin()
-    def _determineCost(self, entry: Entry,
+    def _determineCost(self, row, col, isMatch,
                        leftValid = True, upValid = True, diagValid = True,
                        shift = 0):
-    
-        self.dpTable[entry.loc.row][entry.loc.col] = entry
+        costs = self.costs
+        cell = (row % self.keptRows) * self.tableCols + col
+        # the cell above, in the previous row's columns
+        above = ((row - 1) % self.keptRows) * self.tableCols + col + shift
 
         if leftValid: # moving right -> seq1 gets a hyphen, seq2 gets its letter
-            insCost = self.INDEL + self.dpTable[entry.loc.row][entry.loc.col - 1].cost
+            insCost = self.INDEL + costs[cell - 1]
         else: insCost = float('inf')
 
         if upValid: # moving down -> seq1 gets its letter, seq2 gets a hyphen
-            delCost = self.INDEL + self.dpTable[entry.loc.row - 1][entry.loc.col + shift].cost
+            delCost = self.INDEL + costs[above]
         else: delCost = float('inf')
         
         if diagValid:
-            matCost = self.MATCH + self.dpTable[entry.loc.row - 1][entry.loc.col - 1 + shift].cost
-            subCost = self.SUB + self.dpTable[entry.loc.row - 1][entry.loc.col - 1 + shift].cost
-        else:
-            matCost = float('inf')
-            subCost = float('inf')
-
-        if entry.letter1 == entry.letter2:
-            entry.isMatch = True
+            diagCost = (self.MATCH if isMatch else self.SUB) + costs[above - 1]
+        else: diagCost = float('inf')
         
         # tie priority -> insert, delete, match / substitute
-        move = self._findMin(insCost, delCost, matCost if entry.isMatch else subCost)
-
-        match move:
-            case "left": # insert
-                entry.cost = insCost
-                entry.prev = Entry.Location(entry.loc.row, entry.loc.col - 1)
-                entry.prevDirection = "left"
-            case "up": # delete
-                entry.cost = delCost
-                entry.prev = Entry.Location(entry.loc.row - 1, entry.loc.col + shift)
-                entry.prevDirection = "up"
-            case "diag": # match / substitute
-                entry.cost = matCost if entry.isMatch else subCost
-                entry.prev = Entry.Location(entry.loc.row - 1, entry.loc.col - 1 + shift)
-                entry.prevDirection = "diag"
+        move = self._findMin(insCost, delCost, diagCost)
+
+        if move == LEFT: # insert
+            costs[cell] = insCost
+        elif move == UP: # delete
+            costs[cell] = delCost
+        else: # match / substitute
+            costs[cell] = diagCost
+            if isMatch: move = MATCH_DIAG
+        self.directions[cell] = move
 
     # O(1) time
-    # finds the cheapest option and returns "left", "up", or "diag"
+    # finds the cheapest option and returns LEFT, UP, or DIAG
     def _findMin(self, left, up, diag):
-        if left == up == diag: return "left"
-        elif left <= up and left <= diag: return "left"
-        elif up <= diag: return "up"
-        else: return "diag"
+        if left == up == diag: return LEFT
+        elif left <= up and left <= diag: return LEFT
+        elif up <= diag: return UP
+        else: return DIAG
 
     # O(1) time
     def getCost(self):
-        targetEntry = self.dpTable[-1][-1]
-        if targetEntry == None: return float('inf')
-        else: return targetEntry.cost
+        if self.linearMemory: return self.linearCost
+        lastCell = ((self.tableRows - 1) % self.keptRows + 1) * self.tableCols - 1
+        if self.directions[lastCell] == NO_ENTRY: return float('inf')
+        else: return self.costs[lastCell]
     
-    # O(1) time
-    # accesses _reconstructPath() and _figureAlignments()
+    # O(1) time, but O(mn) or O(kn) for costOnly, which hasn't done the work for it yet
+    # accesses _reconstructPath() and _figureAlignments(), or _linearAlignments()
     def getAlignments(self):
-        if self.dpTable[-1][-1] == None:
+        if self.linearMemory:
+            al1, al2 = self._linearAlignments()
+            if self.didSwitch: return al2, al1
+            else: return al1, al2
+
+        if self.keptRows < self.tableRows:
+            # costOnly for banded: the rows weren't kept, so they're filled again, all of them
+            self.keptRows = self.tableRows
+            self._allocateTable()
+            self._populateTable()
+
+        if self.directions[-1] == NO_ENTRY:
             return "No Alignment Possible.", "No Alignment Possible."
         
         path = self._reconstructPath()
@@ -203,18 +273,23 @@ class SequenceComparer:
         else: return al1, al2
 
     # O(m + n) time for both unrestricted and banded; O(m + n) space as well
+    # returns the (row, col) table cells of the path, from the corner
     def _reconstructPath(self):
         stack = []
 
-        row = len(self.dpTable) - 1
-        col = len(self.dpTable[0]) - 1
+        row = self.tableRows - 1
+        col = self.tableCols - 1
         # the maximum times this will loop is m + n because of Manhatten distance
         while row != 0 and col != 0:
-            currEntry = self.dpTable[row][col]
-            stack.append(currEntry)
-            row = currEntry.prev.row
-            col = currEntry.prev.col
-        stack.append(self.dpTable[0][0])
+            stack.append((row, col))
+            direction = self.directions[row * self.tableCols + col]
+            if direction == LEFT: col -= 1
+            else:
+                # up and diagonal moves go to the previous row's columns
+                if direction != UP: col -= 1
+                col += self._shift(row)
+                row -= 1
+        stack.append((0, 0))
 
         stack.reverse()
         return stack
@@ -224,24 +299,219 @@ class SequenceComparer:
         alignment1 = ""
         alignment2 = ""
         count = 0
-        for entry in path: # will loop maximum m + n times because of Manhatten distance
+        for row, col in path: # will loop maximum m + n times because of Manhatten distance
             if count > 100: break
             count += 1
 
-            if entry.prev == None:
+            direction = self.directions[row * self.tableCols + col]
+            letter1, letter2 = self._letters(row, col)
+            if direction == START:
                 continue # this represents the empty string, so we're good.
-            elif entry.prevDirection == "left":
+            elif direction == LEFT:
                 alignment1 += "-"
-                alignment2 += entry.letter2
-            elif entry.prevDirection == "up":
-                alignment1 += entry.letter1
+                alignment2 += letter2
+            elif direction == UP:
+                alignment1 += letter1
                 alignment2 += "-"
-            elif entry.prevDirection == "diag":
-                alignment1 += entry.letter1
-                alignment2 += entry.letter2
+            elif direction == DIAG or direction == MATCH_DIAG:
+                alignment1 += letter1
+                alignment2 += letter2
             else: return "nogood"
         return alignment1, alignment2
 
+    # O(mn) time, O(n) space
+    # Runs the unrestricted DP from (row1, col1) to (row2, col2), as if (row1, col1) were
+    # the corner of its own table, keeping only two rows. Returns the costs of the last row
+    # and, for each of its cells, the column at which the traceback from that cell would
+    # first reach midRow. Every cell picks its previous cell just like _determineCost()
+    # would, so that's the column the table's own traceback crosses midRow at.
+    def _forwardPass(self, row1, col1, row2, col2, midRow):
+        seq1, seq2 = self.seq1, self.seq2
+        MATCH, INDEL, SUB = self.MATCH, self.INDEL, self.SUB
+        width = col2 - col1
+
+        costs = [INDEL * col for col in range(width + 1)]
+        crossCols = [col1 + col for col in range(width + 1)] if midRow == row1 else [None] * (width + 1)
+
+        for row in range(row1 + 1, row2 + 1): # will repeat m times
+            letter1 = seq1[row - 1]
+            prevCosts, prevCrossCols = costs, crossCols
+            costs = [prevCosts[0] + INDEL] + [0] * width
+            if row == midRow: crossCols = list(range(col1, col2 + 1))
+            elif row > midRow: crossCols = [prevCrossCols[0]] + [0] * width
+
+            for col in range(1, width + 1): # will repeat n times
+                insCost = costs[col - 1] + INDEL
+                delCost = prevCosts[col] + INDEL
+                diagCost = prevCosts[col - 1] + (MATCH if letter1 == seq2[col1 + col - 1] else SUB)
+
+                # tie priority -> insert, delete, match / substitute, as in _findMin()
+                if insCost <= delCost and insCost <= diagCost:
+                    costs[col] = insCost
+                    if row > midRow: crossCols[col] = crossCols[col - 1]
+                elif delCost <= diagCost:
+                    costs[col] = delCost
+                    if row > midRow: crossCols[col] = prevCrossCols[col]
+                else:
+                    costs[col] = diagCost
+                    if row > midRow: crossCols[col] = prevCrossCols[col - 1]
+
+        return costs, crossCols
+
+    # O(kn) time for the k different letters in seq1[row1:row2]
+    # For each of those letters, which of the letters of seq2[col1:col2] match it, and the
+    # MATCH or SUB each of them scores against it
+    def _scoresNumPy(self, row1, col1, row2, col2):
+        codes = self.seq2Codes[col1:col2]
+        scores = {}
+        for letter in set(self.seq1[row1:row2]):
+            matches = codes == ord(letter)
+            scores[letter] = (matches, np.where(matches, self.MATCH, self.SUB))
+        return scores
+
+    # O(n) time, all of it in NumPy
+    # Returns the costs of the next row of the unrestricted table from the costs of the row
+    # above it and rowScores (from _scoresNumPy()), and, if withDirections, the direction
+    # each cell came from. A cell coming from the left needs the cell before it done first,
+    # but the cheapest way into cell j from the left is to come down (or diagonally) into
+    # some cell i < j as cheaply as possible and then take j - i INDELs to the right. So
+    # with fromAbove the cheaper of up and diagonal for each cell, the row is
+    #   costs[j] = min over i <= j of fromAbove[i] + INDEL * (j - i)
+    # which is a running minimum of fromAbove - INDEL * col, plus INDEL * col again. The
+    # sums are exact integers, so the ties go the way _findMin() sends them: left wherever
+    # it's as cheap as the cell's cost, then up, then diagonal.
+    def _nextRowNumPy(self, prevCosts, rowScores, withDirections = True):
+        steps = self.indelSteps[:len(prevCosts)]
+        upCosts = prevCosts + self.INDEL
+        diagCosts = prevCosts[:-1] + rowScores
+
+        fromAbove = upCosts.copy()
+        np.minimum(upCosts[1:], diagCosts, out=fromAbove[1:])
+        fromAbove -= steps
+        costs = np.minimum.accumulate(fromAbove)
+        costs += steps
+        if not withDirections: return costs, None
+
+        directions = np.full(len(costs), UP, dtype=np.uint8) # the first column can only come from above
+        directions[1:][diagCosts < upCosts[1:]] = DIAG
+        directions[1:][costs[:-1] + self.INDEL == costs[1:]] = LEFT
+        return costs, directions
+
+    # O(mn) time, O(n) space, with a NumPy operation per row
+    # _forwardPass() through _nextRowNumPy(). Past midRow, a cell coming from above or
+    # diagonally takes the crossing column of that cell, and a run of cells coming from the
+    # left all take the one of the cell the run starts from.
+    def _forwardPassNumPy(self, row1, col1, row2, col2, midRow):
+        width = col2 - col1
+        colIds = np.arange(width + 1)
+        scores = self._scoresNumPy(row1, col1, row2, col2)
+
+        costs = self.indelSteps[:width + 1]
+        crossCols = col1 + colIds if midRow == row1 else None
+        for row in range(row1 + 1, row2 + 1): # will repeat m times
+            costs, directions = self._nextRowNumPy(costs, scores[self.seq1[row - 1]][1], row > midRow)
+            if row == midRow: crossCols = col1 + colIds
+            elif row > midRow:
+                fromAbove = crossCols.copy()
+                fromAbove[1:] = np.where(directions[1:] == UP, crossCols[1:], crossCols[:-1])
+                runStarts = np.where(directions != LEFT, colIds, 0)
+                crossCols = fromAbove[np.maximum.accumulate(runStarts)]
+
+        return costs, crossCols
+
+    # O(mn) time, O(m + n) space
+    # Yields the cells (row, col) of the table's traceback path from (row1, col1) to
+    # (row2, col2), in order, given that the path goes through both. Each cell's choice
+    # between equally cheap previous cells only depends on the costs, and with (row1, col1)
+    # on the path, a cell on the path picks the same one counting costs from there as from
+    # the corner of the whole table. So a forward pass finds where the path crosses the
+    # middle row, and the halves above and below get the same treatment, until they're
+    # small enough to fill a table for. Stopping early only does the work for what's used.
+    def _linearPath(self, row1, col1, row2, col2, crossCol = None):
+        if row2 - row1 <= 1 or (row2 - row1 + 1) * (col2 - col1 + 1) <= self.LINEAR_BASE_CELLS:
+            yield from self._tablePath(row1, col1, row2, col2)
+            return
+
+        midRow = (row1 + row2) // 2
+        if crossCol == None:
+            if np is not None: crossCol = int(self._forwardPassNumPy(row1, col1, row2, col2, midRow)[1][-1])
+            else: crossCol = self._forwardPass(row1, col1, row2, col2, midRow)[1][-1]
+        yield from self._linearPath(row1, col1, midRow, crossCol)
+        lowerHalf = self._linearPath(midRow, crossCol, row2, col2)
+        next(lowerHalf) # (midRow, crossCol), already given
+        yield from lowerHalf
+
+    # O(mn) time and space for the m x n subproblem
+    # the traceback from (row2, col2) to (row1, col1) through a small table of directions,
+    # its rows from _nextRowNumPy() when there's NumPy
+    def _tablePath(self, row1, col1, row2, col2):
+        seq1, seq2 = self.seq1, self.seq2
+        MATCH, INDEL, SUB = self.MATCH, self.INDEL, self.SUB
+        width = col2 - col1
+
+        if np is not None:
+            scores = self._scoresNumPy(row1, col1, row2, col2)
+            costs = self.indelSteps[:width + 1]
+            directions = [np.full(width + 1, LEFT, dtype=np.uint8)]
+            for row in range(row1 + 1, row2 + 1):
+                costs, rowDirections = self._nextRowNumPy(costs, scores[seq1[row - 1]][1])
+                directions.append(rowDirections)
+        else:
+            costs = [INDEL * col for col in range(width + 1)]
+            directions = [bytearray([LEFT]) * (width + 1)]
+            for row in range(row1 + 1, row2 + 1):
+                letter1 = seq1[row - 1]
+                prevCosts = costs
+                costs = [prevCosts[0] + INDEL] + [0] * width
+                rowDirections = bytearray([UP]) * (width + 1)
+                for col in range(1, width + 1):
+                    insCost = costs[col - 1] + INDEL
+                    delCost = prevCosts[col] + INDEL
+                    diagCost = prevCosts[col - 1] + (MATCH if letter1 == seq2[col1 + col - 1] else SUB)
+                    if insCost <= delCost and insCost <= diagCost:
+                        costs[col] = insCost
+                        rowDirections[col] = LEFT
+                    elif delCost <= diagCost: costs[col] = delCost
+                    else:
+                        costs[col] = diagCost
+                        rowDirections[col] = DIAG
+                directions.append(rowDirections)
+
+        path = []
+        row, col = row2, col2
+        while row != row1 or col != col1:
+            path.append((row, col))
+            direction = directions[row - row1][col - col1]
+            if direction != LEFT: row -= 1
+            if direction != UP: col -= 1
+        path.append((row1, col1))
+        path.reverse()
+        return path
+
+    # O(mn) time, O(m + n) space
+    # The same as _figureAlignments(_reconstructPath()) gives for the full table, which
+    # leaves out the part of the path along the first row or column and stops after 100
+    # characters, so only the start of the path ever gets worked out
+    def _linearAlignments(self):
+        alignment1 = ""
+        alignment2 = ""
+        rows, cols = len(self.seq1), len(self.seq2)
+        prevCell = None
+        for row, col in self._linearPath(0, 0, rows, cols, self.linearCrossCol):
+            if len(alignment1) >= 100: break
+            if row != 0 and col != 0:
+                if prevCell[0] == row: # left
+                    alignment1 += "-"
+                    alignment2 += self.seq2[col - 1]
+                elif prevCell[1] == col: # up
+                    alignment1 += self.seq1[row - 1]
+                    alignment2 += "-"
+                else: # diag
+                    alignment1 += self.seq1[row - 1]
+                    alignment2 += self.seq2[col - 1]
+            prevCell = (row, col)
+        return alignment1, alignment2
+
     # for testing purposes, not to be used by the GUI
     @staticmethod
     def commandLineAccess():
@@ -267,22 +537,21 @@ class SequenceComparer:
             if len(params) != 3:
                 print("Invalid: wrong number of parameters")
                 return
-            print("Minimmum:", self._findMin(params[0], params[1], params[2]))
+            print("Minimmum:", DIRECTION_ARROWS[self._findMin(params[0], params[1], params[2])])
         elif operation == "setEntry":
             if len(params) != 2 and len(params) != 3 and len(params) != 6:
                 print("Invalid: wrong number of parameters")
                 return
-            # self.dpTable[1][0] = Entry(Entry.Location(1,0), "X", "X", 5)
             print("Before:", self)
-            loc = Entry.Location(int(params[0]), int(params[1]))
-            entry = Entry(loc, self.seq1[loc.row - 1], self.seq2[loc.col - 1])
-            if len(params) == 2: self._determineCost(entry)
-            elif len(params) == 3: self._determineCost(entry, True, True, True, int(params[2]))
+            row, col = int(params[0]), int(params[1])
+            isMatch = self.seq1[row - 1] == self.seq2[col - 1]
+            if len(params) == 2: self._determineCost(row, col, isMatch)
+            elif len(params) == 3: self._determineCost(row, col, isMatch, True, True, True, int(params[2]))
             elif len(params) == 6:
                 leftValid = params[3] == "T"
                 upValid = params[4] == "T"
                 diagValid = params[5] == "T"
-                self._determineCost(entry, leftValid, upValid, diagValid, int(params[2]))
+                self._determineCost(row, col, isMatch, leftValid, upValid, diagValid, int(params[2]))
             print("After:", self)
         elif operation == "setEntryInitial":
             if len(params) != 0:
@@ -296,7 +565,7 @@ class SequenceComparer:
                 print("Invalid: wrong number of parameters")
                 return
             print("Before:", self)
-            for col in range(len(self.dpTable[0])):
+            for col in range(self.tableCols):
                 self._fillOneCell(0, col)
             print("After:", self)
         elif operation == "setAllRows":
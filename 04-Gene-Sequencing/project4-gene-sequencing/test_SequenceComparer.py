@@ -0,0 +1,32 @@
+import unittest
+
+from SequenceComparer import SequenceComparer
+
+# the scoring GeneSequencing.py uses
+MATCH = -3
+INDEL = 5
+SUB = 1
+
+
+class BandTest(unittest.TestCase):
+    # a band with no column beside the diagonal used to read the cells next to it out of
+    # the neighbouring rows and come back with a made up alignment
+    def test_zeroBandIsRejected(self):
+        for costOnly in (False, True):
+            for seq1, seq2 in [("acg", "aag"), ("aca", "aaaaa"), ("", "")]:
+                with self.assertRaises(ValueError):
+                    SequenceComparer(seq1, seq2, 1000, 0, MATCH, INDEL, SUB, costOnly = costOnly)
+
+    # the narrowest bands there are, against what the Entry table gave
+    def test_smallBand(self):
+        for seq1, seq2, maxVariation, cost, alignments in [
+                ("gattaca", "gatacaa", 1, -9, ("gattaca", "gatacaa")),
+                ("polynomial", "exponential", 2, -1, ("polynom-ial", "exponential"))]:
+            for costOnly in (False, True):
+                comparer = SequenceComparer(seq1, seq2, 1000, maxVariation, MATCH, INDEL, SUB, costOnly = costOnly)
+                self.assertEqual(comparer.getCost(), cost)
+                self.assertEqual(comparer.getAlignments(), alignments)
+
+
+if __name__ == '__main__':
+    unittest.main()